@@ -10,12 +10,19 @@ An autonomous agent that:
 6. Evaluates coverage and loops if needed
 7. Generates a structured news digest
 """
+import contextlib
+import logging
+import os
+import sys
 import warnings
 from datetime import datetime
 
+import orjson
+
 warnings.filterwarnings("ignore", message="Pydantic serializer warnings")
 
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
 
 from models import GraphState, NewsDigest, ReportOutput
 from nodes import (
@@ -43,6 +50,45 @@ def update_topics_for_retry(state: GraphState) -> dict:
     return {}
 
 
+def dispatch_searches(state: GraphState) -> list[Send]:
+    """
+    Fan out one buscador task per topic via the Send API.
+
+    Each task receives a single-topic slice of the state, so Tavily
+    searches run concurrently and their results merge through the
+    raw_content reducer. An empty topic list still dispatches one task
+    so search_iterations keeps advancing.
+    """
+    shared = {
+        "start_date": state["start_date"],
+        "end_date": state["end_date"],
+        "search_iterations": state.get("search_iterations", 0),
+    }
+    topics = state.get("topics", [])
+    if not topics:
+        return [Send("buscador", {**shared, "topics": []})]
+    return [Send("buscador", {**shared, "topics": [topic]}) for topic in topics]
+
+
+# Suppress run_agent's progress prints (embedding callers that stream events themselves)
+QUIET = os.getenv("NEWSLOOP_QUIET", "0") == "1"
+
+# Level for node progress logs; DEBUG adds per-item lines (topics, videos, failures)
+LOG_LEVEL = os.getenv("NEWSLOOP_LOG_LEVEL", "INFO").upper()
+
+
+def configure_logging() -> None:
+    """Send node logs (the ``nodes`` logger tree) to stdout as bare messages."""
+    logger = logging.getLogger("nodes")
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+
 # =============================================================================
 # Build the Graph
 # =============================================================================
@@ -67,9 +113,9 @@ workflow.set_entry_point("explorador")
 # Define edges
 workflow.add_edge("explorador", "planificador")
 
-# Sequential flow to avoid InvalidUpdateError (raw_content can only receive one value per step)
-# Text branch first, then video branch, then evaluator
-workflow.add_edge("planificador", "buscador")
+# Searches fan out per topic (raw_content/search_iterations have reducers);
+# the rest of the text branch runs once, then video branch, then evaluator
+workflow.add_conditional_edges("planificador", dispatch_searches, ["buscador"])
 workflow.add_edge("buscador", "extractor")
 workflow.add_edge("extractor", "enriquecedor")
 workflow.add_edge("enriquecedor", "buscador_video")
@@ -86,17 +132,50 @@ workflow.add_conditional_edges(
     }
 )
 
-workflow.add_edge("actualizador_topics", "buscador")
+workflow.add_conditional_edges("actualizador_topics", dispatch_searches, ["buscador"])
 workflow.add_edge("analista", END)
 
-# Compile the graph
-app = workflow.compile()
+# Compile the graph once at import; run_agent and the FastAPI server reuse it.
+# No checkpointer: runs are one-shot, so there is no per-step persistence.
+app = workflow.compile(checkpointer=None, debug=False)
 
 
 # =============================================================================
 # Public API
 # =============================================================================
 
+def initial_state(
+    objective: str,
+    start_date: str,
+    end_date: str,
+    context: str = "",
+) -> GraphState:
+    """
+    Build the initial GraphState for a run.
+
+    Shared by run_agent (CLI) and the FastAPI server, which streams
+    the compiled graph directly.
+    """
+    return {
+        "objective": objective,
+        "context": context,
+        "start_date": start_date,
+        "end_date": end_date,
+        "exploration_results": [],
+        "topics": [],
+        "planning_reasoning": "",
+        "raw_content": [],
+        "seen_urls": set(),
+        "seen_hashes": set(),
+        "entities_present": False,
+        "evaluation": None,
+        "search_iterations": 0,
+        "digest": None,
+        "video_sources": [],
+        "visual_analysis": [],
+    }
+
+
 def run_agent(
     objective: str,
     start_date: str,
@@ -123,41 +202,50 @@ def run_agent(
     Returns:
         NewsDigest with the structured report, or None if failed
     """
-    inputs: GraphState = {
-        "objective": objective,
-        "context": context,
-        "start_date": start_date,
-        "end_date": end_date,
-        "exploration_results": [],
-        "topics": [],
-        "planning_reasoning": "",
-        "raw_content": [],
-        "evaluation": None,
-        "search_iterations": 0,
-        "digest": None,
-        "video_sources": [],
-        "visual_analysis": [],
-    }
+    inputs = initial_state(objective, start_date, end_date, context)
 
-    print(f"\n{'='*60}")
-    print(f"NEWS RESEARCH AGENT")
-    print(f"{'='*60}")
-    print(f"Objective: {objective}")
-    if context:
-        print(f"Context: {context}")
-    print(f"Period: {start_date} to {end_date}")
-    print(f"{'='*60}\n")
+    if not QUIET:
+        print(f"\n{'='*60}")
+        print(f"NEWS RESEARCH AGENT")
+        print(f"{'='*60}")
+        print(f"Objective: {objective}")
+        if context:
+            print(f"Context: {context}")
+        print(f"Period: {start_date} to {end_date}")
+        print(f"{'='*60}\n")
 
     final_state = None
-    for output in app.stream(inputs):
+    for output in app.stream(inputs, stream_mode="updates"):
         for key, value in output.items():
-            print(f"[OK] Node completed: {key}")
+            if not QUIET:
+                print(f"[OK] Node completed: {key}")
             if key == "analista":
                 final_state = value
 
     return final_state.get("digest") if final_state else None
 
 
+def build_report(
+    digest: NewsDigest,
+    objective: str,
+    start_date: str,
+    end_date: str,
+) -> ReportOutput:
+    """
+    Wrap a digest in a ReportOutput stamped with the current time.
+
+    The digest was already validated when the LLM (or the prompt cache)
+    produced it, so model_construct skips a second validation pass.
+    """
+    return ReportOutput.model_construct(
+        generated_at=datetime.now().isoformat(),
+        objective=objective,
+        period_start=start_date,
+        period_end=end_date,
+        digest=digest,
+    )
+
+
 def save_report(
     digest: NewsDigest,
     objective: str,
@@ -166,7 +254,7 @@ def save_report(
     filename: str = "reporte.json",
 ) -> ReportOutput:
     """
-    Save the digest as a JSON report using Pydantic serialization.
+    Save the digest as a JSON report (Pydantic model_dump + orjson).
 
     Args:
         digest: The NewsDigest to save
@@ -178,16 +266,19 @@ def save_report(
     Returns:
         The ReportOutput model that was saved
     """
-    report = ReportOutput(
-        generated_at=datetime.now().isoformat(),
-        objective=objective,
-        period_start=start_date,
-        period_end=end_date,
-        digest=digest,
-    )
-
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(report.model_dump_json(indent=2))
+    report = build_report(digest, objective, start_date, end_date)
+
+    # Write to a temp file and rename, so a crash never leaves a partial report
+    data = orjson.dumps(report.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+    tmp = f"{filename}.tmp"
+    try:
+        with open(tmp, "wb", buffering=1 << 20) as f:
+            f.write(data)
+        os.replace(tmp, filename)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
 
     print(f"[SAVE] Saved to: {filename}")
     return report
@@ -198,6 +289,8 @@ def save_report(
 # =============================================================================
 
 if __name__ == "__main__":
+    configure_logging()
+
     print("=" * 60)
     print("  NEWS RESEARCH AGENT")
     print("=" * 60)
@@ -5,35 +5,65 @@ Run with: uvicorn app:app --reload
 """
 import asyncio
 import json
-import sys
-import threading
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
 from contextlib import asynccontextmanager
-from datetime import datetime
 from pathlib import Path
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Query
 from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from pydantic import BaseModel as PydanticModel
 
-from agent import run_agent
+from agent import app as graph, build_report, configure_logging, initial_state
 from converter import to_markdown
 from models import NewsDigest, ReportOutput
+from nodes import warm_up
+
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
 # In-memory state (single-process local demo)
 # =============================================================================
 
-_last_report: ReportOutput | None = None
-_run_lock = asyncio.Lock()
+# Up to RUN_CONCURRENCY agent runs at once; extra /run requests wait for a slot
+RUN_CONCURRENCY = int(os.getenv("NEWSLOOP_CONCURRENCY", "2"))
+MAX_STORED_REPORTS = 20
+
+_run_sem = asyncio.Semaphore(RUN_CONCURRENCY)
+
+# Finished reports by job id (oldest evicted first) and their serialized downloads
+_reports: OrderedDict[str, ReportOutput] = OrderedDict()
+_cached_json: dict[str, bytes] = {}
+_cached_md: dict[str, bytes] = {}
 
 
 # =============================================================================
 # Bootstrap
 # =============================================================================
 
+# Opt-in: spend one max_tokens=1 call at startup so TLS/auth is warm for the first /run
+WARMUP_ENABLED = os.getenv("NEWSLOOP_WARMUP", "0") == "1"
+
+
+def _warm_llm() -> None:
+    try:
+        warm_up()
+        logger.info("  -> LLM connection warmed up")
+    except Exception as e:
+        logger.warning("  ! LLM warm-up failed: %s", e)
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    # agent/nodes/models are imported at module top; the graph is already compiled
+    configure_logging()
+    if WARMUP_ENABLED:
+        await asyncio.to_thread(_warm_llm)
     print("\nNewsloop running at http://localhost:8000\n")
     yield
 
@@ -60,6 +90,75 @@ def _sse(payload: dict) -> str:
     return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
 
 
+def _token_text(chunk) -> str:
+    """Text of a streamed LLM chunk; structured-output calls stream JSON as tool-call args."""
+    if isinstance(chunk.content, str) and chunk.content:
+        return chunk.content
+    return "".join(tc.get("args") or "" for tc in getattr(chunk, "tool_call_chunks", None) or [])
+
+
+# Token chunks are coalesced into one SSE event per node every ~20 ms / 32 chunks
+TOKEN_FLUSH_SECONDS = 0.02
+TOKEN_FLUSH_CHUNKS = 32
+
+
+class _TokenBuffer:
+    """Coalesces consecutive LLM token chunks from the same node into fewer SSE events."""
+
+    def __init__(self):
+        self.node = ""
+        self.parts: list[str] = []
+        self.started = 0.0
+
+    def add(self, node: str, text: str) -> list[str]:
+        """Buffer a chunk; return any SSE events that are ready to send."""
+        events = []
+        if self.parts and node != self.node:
+            events.extend(self.flush())
+        if not self.parts:
+            self.node = node
+            self.started = time.monotonic()
+        self.parts.append(text)
+        if (
+            len(self.parts) >= TOKEN_FLUSH_CHUNKS
+            or time.monotonic() - self.started >= TOKEN_FLUSH_SECONDS
+        ):
+            events.extend(self.flush())
+        return events
+
+    def flush(self) -> list[str]:
+        if not self.parts:
+            return []
+        event = _sse({"type": "token", "node": self.node, "delta": "".join(self.parts)})
+        self.parts = []
+        return [event]
+
+
+def _report_json(job_id: str) -> bytes:
+    if job_id not in _cached_json:
+        report = _reports[job_id]
+        _cached_json[job_id] = orjson.dumps(report.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+    return _cached_json[job_id]
+
+
+def _report_md(job_id: str) -> bytes:
+    if job_id not in _cached_md:
+        _cached_md[job_id] = to_markdown(_reports[job_id]).encode("utf-8")
+    return _cached_md[job_id]
+
+
+def _store_report(job_id: str, report: ReportOutput) -> None:
+    """Keep a finished report, evicting the oldest past MAX_STORED_REPORTS."""
+    _reports[job_id] = report
+    while len(_reports) > MAX_STORED_REPORTS:
+        old_id, _ = _reports.popitem(last=False)
+        _cached_json.pop(old_id, None)
+        _cached_md.pop(old_id, None)
+    # Serialize both downloads now so the first click doesn't pay for it
+    _report_json(job_id)
+    _report_md(job_id)
+
+
 class RunRequest(PydanticModel):
     objective: str
     start_date: str
@@ -72,103 +171,78 @@ class RunRequest(PydanticModel):
 # =============================================================================
 
 async def _stream_agent(
+    job_id: str,
     objective: str,
     start_date: str,
     end_date: str,
     context: str,
 ):
-    """Runs the agent in a background thread and yields SSE events."""
-    global _last_report
-
-    loop = asyncio.get_running_loop()
-    queue: asyncio.Queue[str] = asyncio.Queue()
-
-    class _Capture:
-        """
-        Replaces sys.stdout to intercept agent print() calls.
-        Thread-safe: maintains a per-thread line buffer, forwards complete
-        lines to the asyncio queue via call_soon_threadsafe.
-        """
-
-        def __init__(self, real_stdout):
-            self._real = real_stdout
-            self._bufs: dict[int, str] = {}
-            self._lock = threading.Lock()
-
-        def write(self, text: str) -> int:
-            self._real.write(text)  # mirror to terminal so uvicorn logs still work
-            tid = threading.get_ident()
-            with self._lock:
-                buf = self._bufs.get(tid, "") + text
-                while "\n" in buf:
-                    line, buf = buf.split("\n", 1)
-                    stripped = line.strip()
-                    if stripped:
-                        loop.call_soon_threadsafe(queue.put_nowait, stripped)
-                self._bufs[tid] = buf
-            return len(text)
-
-        def flush(self):
-            self._real.flush()
-
-    def _run():
-        real_out = sys.stdout
-        sys.stdout = _Capture(real_out)
-        try:
-            digest = run_agent(objective, start_date, end_date, context)
-            if digest:
-                sentinel = "__DONE__:" + digest.model_dump_json()
-            else:
-                sentinel = "__ERROR__:Agent produced no digest. Check your API keys and try again."
-        except Exception as exc:
-            sentinel = f"__ERROR__:{exc}"
-        finally:
-            sys.stdout = real_out
-        loop.call_soon_threadsafe(queue.put_nowait, sentinel)
-
-    threading.Thread(target=_run, daemon=True).start()
-
-    # Drain the queue until done/error sentinel
-    while True:
-        try:
-            line = await asyncio.wait_for(queue.get(), timeout=600.0)
-        except asyncio.TimeoutError:
-            yield _sse({"type": "error", "message": "Agent timed out after 10 minutes."})
-            return
-
-        if line.startswith("__DONE__:"):
-            digest = NewsDigest.model_validate_json(line[9:])
-            report = ReportOutput(
-                generated_at=datetime.now().isoformat(),
-                objective=objective,
-                period_start=start_date,
-                period_end=end_date,
-                digest=digest,
-            )
-            _last_report = report
-            yield _sse({"type": "done", "report": json.loads(report.model_dump_json())})
-            return
-
-        elif line.startswith("__ERROR__:"):
-            yield _sse({"type": "error", "message": line[10:]})
-            return
-
-        else:
-            yield _sse({"type": "log", "line": line})
+    """
+    Streams the compiled graph with astream and yields SSE events.
+
+    stream_mode=["updates", "messages"] interleaves node-complete updates
+    (one "log" event per node) with LLM token chunks ("token" events), so
+    the UI shows progress during long planner/evaluator/analyst calls.
+    Token chunks are batched through _TokenBuffer before hitting the wire.
+    The final "done" event carries the job id used by the download links.
+    """
+    inputs = initial_state(objective, start_date, end_date, context)
+    digest: NewsDigest | None = None
+    tokens = _TokenBuffer()
+
+    try:
+        async with asyncio.timeout(600):
+            async for mode, payload in graph.astream(inputs, stream_mode=["updates", "messages"]):
+                if mode == "messages":
+                    chunk, meta = payload
+                    text = _token_text(chunk)
+                    if text:
+                        for event in tokens.add(meta.get("langgraph_node", ""), text):
+                            yield event
+                    continue
+                for event in tokens.flush():
+                    yield event
+                for node, delta in payload.items():
+                    if node == "analista" and delta:
+                        digest = delta.get("digest")
+                    yield _sse({
+                        "type": "log",
+                        "node": node,
+                        "state_delta": sorted(delta) if delta else [],
+                        "line": f"[OK] Node completed: {node}",
+                    })
+    except TimeoutError:
+        yield _sse({"type": "error", "message": "Agent timed out after 10 minutes."})
+        return
+    except Exception as exc:
+        yield _sse({"type": "error", "message": str(exc)})
+        return
+
+    if not digest:
+        yield _sse({
+            "type": "error",
+            "message": "Agent produced no digest. Check your API keys and try again.",
+        })
+        return
+
+    report = build_report(digest, objective, start_date, end_date)
+    _store_report(job_id, report)
+    yield _sse({"type": "done", "id": job_id, "report": report.model_dump(mode="json")})
 
 
 @app.post("/run")
 async def run(req: RunRequest):
+    job_id = uuid.uuid4().hex[:12]
+
     async def _guarded():
-        if _run_lock.locked():
+        if _run_sem.locked():
             yield _sse({
-                "type": "error",
-                "message": "A research run is already in progress. Please wait.",
+                "type": "log",
+                "line": "Queued: other research runs are in progress, waiting for a free slot...",
             })
-            return
-        async with _run_lock:
+        async with _run_sem:
             async for chunk in _stream_agent(
-                req.objective, req.start_date, req.end_date, req.context
+                job_id, req.objective, req.start_date, req.end_date, req.context
             ):
                 yield chunk
 
@@ -188,24 +262,26 @@ async def run(req: RunRequest):
 # =============================================================================
 
 @app.get("/download/json")
-async def download_json():
-    if _last_report is None:
-        return Response("No report available yet. Run a research session first.", status_code=404)
-    name = f"newsloop_{_last_report.period_start}_{_last_report.period_end}.json"
+async def download_json(job_id: str = Query(..., alias="id")):
+    if job_id not in _reports:
+        return Response("Report not found. Run a research session first.", status_code=404)
+    report = _reports[job_id]
+    name = f"newsloop_{report.period_start}_{report.period_end}.json"
     return Response(
-        content=_last_report.model_dump_json(indent=2),
+        content=_report_json(job_id),
         media_type="application/json",
         headers={"Content-Disposition": f'attachment; filename="{name}"'},
     )
 
 
 @app.get("/download/md")
-async def download_md():
-    if _last_report is None:
-        return Response("No report available yet. Run a research session first.", status_code=404)
-    name = f"newsloop_{_last_report.period_start}_{_last_report.period_end}.md"
+async def download_md(job_id: str = Query(..., alias="id")):
+    if job_id not in _reports:
+        return Response("Report not found. Run a research session first.", status_code=404)
+    report = _reports[job_id]
+    name = f"newsloop_{report.period_start}_{report.period_end}.md"
     return Response(
-        content=to_markdown(_last_report),
+        content=_report_md(job_id),
         media_type="text/markdown; charset=utf-8",
         headers={"Content-Disposition": f'attachment; filename="{name}"'},
     )
@@ -12,11 +12,13 @@ import argparse
 import shutil
 import sys
 from pathlib import Path
-
-from docx import Document
+from typing import TYPE_CHECKING
 
 from models import ReportOutput
 
+if TYPE_CHECKING:
+    from docx.document import Document
+
 
 # =============================================================================
 # Output directory
@@ -29,6 +31,16 @@ REPORTES_DIR = Path(__file__).resolve().parent / "reportes"
 # Formatters
 # =============================================================================
 
+# Labels shared by every output format
+LABELS = {
+    "title": "News Research Report",
+    "generated": "Generated",
+    "objective": "Objective",
+    "period": "Period",
+    "sources": "Sources",
+}
+
+
 def to_markdown(report: ReportOutput) -> str:
     """
     Convert a ReportOutput to a Markdown string.
@@ -39,22 +51,20 @@ def to_markdown(report: ReportOutput) -> str:
     Returns:
         Formatted Markdown string
     """
-    lines: list[str] = []
-    lines.append("# News Research Report\n")
-    lines.append(f"*Generated: {report.generated_at}*\n")
-    lines.append(f"**Objective:** {report.objective}\n")
-    lines.append(f"**Period:** {report.period_start} to {report.period_end}\n")
-    lines.append("---\n")
-
-    for section in report.digest.sections:
-        lines.append(f"## {section.title}\n")
-        lines.append(f"{section.article}\n")
-        lines.append("**Sources:**\n")
-        for source in section.sources:
-            lines.append(f"- {source}")
-        lines.append("\n---\n")
-
-    return "\n".join(lines)
+    header = (
+        f"# {LABELS['title']}\n\n"
+        f"*{LABELS['generated']}: {report.generated_at}*\n\n"
+        f"**{LABELS['objective']}:** {report.objective}\n\n"
+        f"**{LABELS['period']}:** {report.period_start} to {report.period_end}\n\n"
+        "---\n"
+    )
+    sections = "".join(
+        f"\n## {section.title}\n\n{section.article}\n\n**{LABELS['sources']}:**\n\n"
+        + "".join(f"- {source}\n" for source in section.sources)
+        + "\n---\n"
+        for section in report.digest.sections
+    )
+    return header + sections
 
 
 def to_plaintext(report: ReportOutput) -> str:
@@ -68,50 +78,49 @@ def to_plaintext(report: ReportOutput) -> str:
         Formatted plain-text string
     """
     sep = "=" * 60
-    lines: list[str] = []
-    lines.append(sep)
-    lines.append("NEWS RESEARCH REPORT")
-    lines.append(sep)
-    lines.append(f"Generated: {report.generated_at}")
-    lines.append(f"Objective: {report.objective}")
-    lines.append(f"Period:    {report.period_start} to {report.period_end}")
-    lines.append(sep)
-    lines.append("")
-
-    for i, section in enumerate(report.digest.sections, 1):
-        lines.append(f"{i}. {section.title}")
-        lines.append(f"   {section.article}")
-        lines.append("   Sources:")
-        for source in section.sources:
-            lines.append(f"     - {source}")
-        lines.append("")
-
-    return "\n".join(lines)
+    header = (
+        f"{sep}\n{LABELS['title'].upper()}\n{sep}\n"
+        f"{LABELS['generated']}: {report.generated_at}\n"
+        f"{LABELS['objective']}: {report.objective}\n"
+        f"{LABELS['period'] + ':':<11}{report.period_start} to {report.period_end}\n"
+        f"{sep}\n"
+    )
+    sections = "".join(
+        f"\n{i}. {section.title}\n   {section.article}\n   {LABELS['sources']}:\n"
+        + "".join(f"     - {source}\n" for source in section.sources)
+        for i, section in enumerate(report.digest.sections, 1)
+    )
+    return header + sections
 
 
-def to_docx(report: ReportOutput) -> Document:
+def to_docx(report: ReportOutput) -> "Document":
     """
     Convert a ReportOutput to a python-docx Document.
 
+    python-docx is imported here rather than at module level, so
+    importing the text formatters (e.g. from app.py) doesn't load it.
+
     Args:
         report: Validated ReportOutput model
 
     Returns:
         python-docx Document object (save with .save())
     """
+    from docx import Document
+
     doc = Document()
 
-    doc.add_heading("News Research Report", level=0)
+    doc.add_heading(LABELS["title"], level=0)
 
-    doc.add_paragraph(f"Generated: {report.generated_at}")
-    doc.add_paragraph(f"Objective: {report.objective}")
-    doc.add_paragraph(f"Period: {report.period_start} to {report.period_end}")
+    doc.add_paragraph(f"{LABELS['generated']}: {report.generated_at}")
+    doc.add_paragraph(f"{LABELS['objective']}: {report.objective}")
+    doc.add_paragraph(f"{LABELS['period']}: {report.period_start} to {report.period_end}")
 
     for section in report.digest.sections:
         doc.add_heading(section.title, level=1)
         doc.add_paragraph(section.article)
 
-        doc.add_paragraph("Sources:", style="List Bullet")
+        doc.add_paragraph(f"{LABELS['sources']}:", style="List Bullet")
         for source in section.sources:
             doc.add_paragraph(source, style="List Bullet 2")
 
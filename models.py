@@ -2,21 +2,23 @@
 Pydantic models for the News Bot agent.
 """
 import operator
-from typing import Annotated, TypedDict
+from typing import Annotated
 
 from pydantic import BaseModel, Field
+from typing_extensions import NotRequired, TypedDict
 
 
 # =============================================================================
 # Pydantic Models for Structured LLM Output
 # =============================================================================
 
-class VisualInsight(BaseModel):
+# A TypedDict (validated as a plain dict) since it only nests inside TopicSection
+class VisualInsight(TypedDict):
     """Analysis of a video from Reka Vision."""
     video_url: str
     video_title: str
     analysis: str
-    source_topic: str = ""
+    source_topic: NotRequired[str]
 
 
 class TopicSection(BaseModel):
@@ -63,6 +65,38 @@ class Evaluation(BaseModel):
 # Graph State
 # =============================================================================
 
+def merge_raw_content(left: list[dict], right: list[dict]) -> list[dict]:
+    """
+    Reducer for raw_content: upsert topic items keyed by topic name.
+
+    Parallel buscador tasks each contribute their own topic (appended),
+    while extractor/enriquecedor return the full list and replace the
+    existing items in place, keeping the original topic order. A retry
+    search (a different search_iteration) that repeats an existing topic
+    name is merged into it instead: sources already there are kept as is
+    (they may be extracted and enriched) and only new URLs are added.
+
+    Each merge is O(len(left) + len(right)) and builds a new list rather
+    than extending `left`, which LangGraph may still hold elsewhere.
+    """
+    merged = {item["topic"]: item for item in left}
+    for item in right:
+        existing = merged.get(item["topic"])
+        if existing is not None and existing.get("search_iteration") != item.get("search_iteration"):
+            known = {source["url"] for source in existing["sources"]}
+            item = {**item, "sources": [
+                *existing["sources"],
+                *(source for source in item["sources"] if source["url"] not in known),
+            ]}
+        merged[item["topic"]] = item
+    return list(merged.values())
+
+
+def max_iteration(left: int, right: int) -> int:
+    """Reducer for search_iterations: parallel searches report the same next value."""
+    return max(left, right)
+
+
 class GraphState(TypedDict):
     """State that flows through the LangGraph agent."""
     # High-level objective (input)
@@ -82,12 +116,19 @@ class GraphState(TypedDict):
     topics: list[str]
     planning_reasoning: str
 
-    # Search and extraction results
-    raw_content: list[dict]
+    # Search and extraction results (merged by topic across parallel searches)
+    raw_content: Annotated[list[dict], merge_raw_content]
+
+    # Dedupe across retry loops: URLs already sent to extract, body hashes already enriched
+    seen_urls: Annotated[set[str], operator.or_]
+    seen_hashes: Annotated[set[str], operator.or_]
+
+    # Set by the enricher: False lets the analyst skip the entity summary walk
+    entities_present: bool
 
     # Evaluation output
     evaluation: Evaluation | None
-    search_iterations: int
+    search_iterations: Annotated[int, max_iteration]
 
     # Final output
     digest: NewsDigest | None
@@ -1,8 +1,14 @@
 """
 Node functions for the News Bot LangGraph agent.
+
+.env is loaded here, once, before any node module reads its settings.
 """
+from dotenv import load_dotenv
+
+load_dotenv()
+
 from nodes.explorer import explorer_node
-from nodes.planner import planner_node
+from nodes.planner import planner_node, warm_up
 from nodes.searcher import search_news_node
 from nodes.extractor import extract_content_node
 from nodes.enricher import enrich_content_node
@@ -22,4 +28,5 @@ __all__ = [
     "analyze_news_node",
     "video_searcher_node",
     "visual_analyzer_node",
+    "warm_up",
 ]
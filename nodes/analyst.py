@@ -4,17 +4,91 @@ Analyst node - generates the final news digest report.
 Leverages Pioneer AI entity data (when available) to provide the LLM
 with structured facts (companies, people, figures) for richer output.
 """
+import logging
 import os
+from bisect import bisect_left
 from datetime import datetime
 
-from dotenv import load_dotenv
+import orjson
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 from models import GraphState, NewsDigest
+from nodes.llm_cache import cached_structured_invoke
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-model = ChatOpenAI(model="gpt-5-2025-08-07", temperature=0.0)
+# Created on first use (see _model) so importing the module builds no client
+model: ChatOpenAI | None = None
+
+
+def _model() -> ChatOpenAI:
+    """Return the module chat model, creating it on first call."""
+    global model
+    if model is None:
+        # prompt_cache_key routes every analyst call to the same OpenAI prompt-cache
+        # shard, so the static SYSTEM_PROMPT prefix below is billed at the cached rate.
+        model = ChatOpenAI(
+            model="gpt-5-2025-08-07",
+            temperature=0.0,
+            model_kwargs={"prompt_cache_key": "newsloop-analyst"},
+        )
+    return model
+
+
+# Static instructions first (system message) so the provider can cache the
+# prefix; date, objective, entities and collected data follow as the user message.
+SYSTEM_PROMPT = """You are a professional news analyst.
+
+Your task is to generate a structured news summary from the data the user provides.
+For each relevant topic, write:
+1. A descriptive title
+2. An article of 100 to 150 words summarizing the key points with concrete data (figures, companies, locations)
+3. List the URLs of the external sources used (field "sources"); include video URLs where relevant
+
+If a KEY ENTITIES block is provided, use it to ensure your report references
+specific people, organisations, monetary amounts, and locations by name.
+
+If video analysis is provided, integrate its insights into the relevant sections and include the video URLs in the "sources" field.
+"""
+
+MAX_ENTITIES_PER_LABEL = 15
+MAX_SUMMARY_CHARS = 800
+
+# Per-run data, filled with str.format in analyze_news_node
+USER_PROMPT = """Today's date is {date}.
+
+Report objective: {objective}
+{context_block}{entity_section}
+Collected news data:
+{raw_content}{video_context}
+"""
+
+
+def _compact_raw_content(raw_content: list[dict]) -> list[dict]:
+    """
+    Keep only the source fields the analyst needs, with content cut to a summary.
+
+    Extracted articles can carry ~3000 characters each; the first
+    MAX_SUMMARY_CHARS are enough for a 100-150 word section and keep the
+    prompt (and time to first token) bounded as sources pile up.
+    """
+    return [
+        {
+            "topic": topic_data.get("topic", ""),
+            "sources": [
+                {
+                    "title": source.get("title", ""),
+                    "url": source.get("url", ""),
+                    "published_date": source.get("published_date", ""),
+                    "summary": source.get("content", "")[:MAX_SUMMARY_CHARS],
+                    "entities": source.get("entities", {}),
+                }
+                for source in topic_data.get("sources", [])
+            ],
+        }
+        for topic_data in raw_content
+    ]
 
 
 def _build_entity_summary(raw_content: list[dict]) -> str:
@@ -24,24 +98,29 @@ def _build_entity_summary(raw_content: list[dict]) -> str:
     Returns a text block listing key entities by type, or an empty
     string if no entities were found.
     """
-    all_entities: dict[str, set[str]] = {}
-
+    # Per label, only the MAX_ENTITIES_PER_LABEL smallest unique values are
+    # kept (sorted), so memory stays bounded however many sources there are
+    top: dict[str, list[str]] = {}
     for topic_data in raw_content:
         for source in topic_data.get("sources", []):
-            entities = source.get("entities", {})
-            for label, values in entities.items():
-                if label not in all_entities:
-                    all_entities[label] = set()
-                for v in values:
-                    all_entities[label].add(v)
-
-    if not all_entities:
+            for label, values in source.get("entities", {}).items():
+                kept = top.setdefault(label, [])
+                for value in values:
+                    if len(kept) == MAX_ENTITIES_PER_LABEL and value >= kept[-1]:
+                        continue
+                    i = bisect_left(kept, value)
+                    if i < len(kept) and kept[i] == value:
+                        continue
+                    kept.insert(i, value)
+                    if len(kept) > MAX_ENTITIES_PER_LABEL:
+                        kept.pop()
+
+    if not top:
         return ""
 
     lines = ["KEY ENTITIES EXTRACTED (via Pioneer AI NER):"]
-    for label, values in sorted(all_entities.items()):
-        joined = ", ".join(sorted(values)[:15])
-        lines.append(f"  {label}: {joined}")
+    for label in sorted(top):
+        lines.append(f"  {label}: {', '.join(top[label])}")
 
     return "\n".join(lines)
 
@@ -59,7 +138,7 @@ def analyze_news_node(state: GraphState) -> dict:
     Returns:
         Dictionary with the final NewsDigest
     """
-    print("--- GENERATING REPORT ---")
+    logger.info("--- GENERATING REPORT ---")
 
     date = datetime.now().strftime("%Y-%m-%d")
     objective = state.get("objective", "News summary")
@@ -70,34 +149,27 @@ def analyze_news_node(state: GraphState) -> dict:
     visual_analysis = state.get("visual_analysis", [])
     video_context = ""
     if visual_analysis:
-        video_context = "\n\nANALYZED VIDEO CONTENT:\n"
-        for va in visual_analysis:
-            video_context += f"\nVideo: {va['video_title']}\nURL: {va['video_url']}\nAnalysis: {va['analysis']}\n"
+        video_context = "\n\nANALYZED VIDEO CONTENT:\n" + "".join(
+            f"\nVideo: {va['video_title']}\nURL: {va['video_url']}\nAnalysis: {va['analysis']}\n"
+            for va in visual_analysis
+        )
 
     context_block = f"\nResearch context: {context}\n" if context else ""
-    entity_block = _build_entity_summary(raw_content)
+    # The enricher flags whether any entities exist; skip the walk when none do
+    entity_block = _build_entity_summary(raw_content) if state.get("entities_present", True) else ""
     entity_section = f"\n\n{entity_block}\n" if entity_block else ""
 
-    prompt = f"""You are a professional news analyst.
-Today's date is {date}.
-
-Report objective: {objective}
-{context_block}
-Your task is to generate a structured news summary.
-For each relevant topic, write:
-1. A descriptive title
-2. An article of 100 to 150 words summarizing the key points with concrete data (figures, companies, locations)
-3. List the URLs of the external sources used (field "sources"); include video URLs where relevant
-{entity_section}
-Use the entity data above (if present) to ensure your report references
-specific people, organisations, monetary amounts, and locations by name.
-
-If video analysis is provided below, integrate its insights into the relevant sections and include the video URLs in the "sources" field.
-
-Collected news data:
-{raw_content}{video_context}
-"""
-
-    digest = model.with_structured_output(NewsDigest).invoke(prompt)
+    user_prompt = USER_PROMPT.format(
+        date=date,
+        objective=objective,
+        context_block=context_block,
+        entity_section=entity_section,
+        # Compact JSON instead of the Python repr: fewer tokens, unambiguous to the model
+        raw_content=orjson.dumps(_compact_raw_content(raw_content)).decode(),
+        video_context=video_context,
+    )
+    prompt = [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=user_prompt)]
+
+    digest = cached_structured_invoke(_model(), NewsDigest, prompt)
 
     return {"digest": digest}
@@ -4,18 +4,28 @@ Enricher node - extracts structured entities from article content using Pioneer
 Uses the fine-tuned GLiNER model (news-explorer-ner) to identify people,
 organisations, locations, products, monetary figures, events, and dates
 in every source article, adding an 'entities' dict to each source.
+
+Bodies are hashed (blake2b of the first 4 KB) so duplicates surfaced by
+different queries, or already enriched in an earlier loop iteration
+(seen_hashes), reuse existing entities instead of calling Pioneer again.
 """
+import hashlib
 import html
+import json
+import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
+import lxml.html
+from lxml.etree import ParserError
 
 from models import GraphState
+from nodes.llm_cache import LLMCache
 from nodes.pioneer_client import pioneer_extract
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 ENRICHER_MODEL_ID = os.getenv(
     "PIONEER_ENRICHER_MODEL_ID",
@@ -32,17 +42,43 @@ ENRICHER_SCHEMA = [
     "DATE",
 ]
 
+# On-disk cache of Pioneer results keyed by sha256(model || schema || text)
+PIONEER_CACHE_ENABLED = os.getenv("PIONEER_CACHE", "0") == "1"
+PIONEER_CACHE_PATH = Path(
+    os.getenv("PIONEER_CACHE_PATH", Path(__file__).resolve().parent.parent / ".cache" / "pioneer.sqlite")
+)
+
+_entity_cache: LLMCache | None = None
+
+# Max concurrent Pioneer requests (each is a blocking HTTP round-trip)
+MAX_PIONEER_WORKERS = int(os.getenv("MAX_PIONEER_WORKERS", "8"))
+
 _MD_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
 _MD_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
-_MD_HEADING_RE = re.compile(r"^#{1,6}\s+", re.MULTILINE)
-_URL_RE = re.compile(r"https?://\S+")
-_ANGLE_BRACKETS_RE = re.compile(r"[<>]")
-_BRACKET_RE = re.compile(r"[\[\]()]")
-_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]")
+# Headings, URLs, brackets and control chars are all deleted, so one
+# alternation strips them in a single scan (runs after the link rewrite)
+_STRIP_RE = re.compile(
+    r"^#{1,6}\s+"
+    r"|https?://\S+"
+    r"|[<>\[\]()]"
+    r"|[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]",
+    re.MULTILINE,
+)
 _MULTI_SPACE_RE = re.compile(r"[ \t]+")
 _MULTI_NEWLINE_RE = re.compile(r"\n{3,}")
 
 
+def _html_to_text(text: str) -> str:
+    """Text nodes of an HTML fragment joined by spaces (raw text if it won't parse)."""
+    try:
+        root = lxml.html.fromstring(text)
+    except (ParserError, ValueError):
+        return text
+    for element in list(root.iter("script", "style")):
+        element.drop_tree()
+    return " ".join(root.itertext())
+
+
 def _sanitize_for_pioneer(text: str) -> str:
     """
     Aggressively strip HTML/JS/Markdown/URLs so Pioneer's WAF accepts the request.
@@ -50,20 +86,75 @@ def _sanitize_for_pioneer(text: str) -> str:
     Tavily sometimes returns Markdown-formatted content (images, links,
     headings) which triggers Pioneer's WAF (especially ``![...]``).
     """
-    text = BeautifulSoup(text, "lxml").get_text(separator=" ")
+    # Plain text (the common Tavily case) has no tags to parse
+    if "<" in text:
+        text = _html_to_text(text)
     text = html.unescape(text)
     text = _MD_IMAGE_RE.sub("", text)
     text = _MD_LINK_RE.sub(r"\1", text)
-    text = _MD_HEADING_RE.sub("", text)
-    text = _URL_RE.sub("", text)
-    text = _ANGLE_BRACKETS_RE.sub("", text)
-    text = _BRACKET_RE.sub("", text)
-    text = _CONTROL_CHARS_RE.sub("", text)
+    text = _STRIP_RE.sub("", text)
     text = _MULTI_SPACE_RE.sub(" ", text)
     text = _MULTI_NEWLINE_RE.sub("\n\n", text)
     return text.strip()
 
 
+def _entity_key(text: str) -> str:
+    raw = f"{ENRICHER_MODEL_ID}\x00{','.join(ENRICHER_SCHEMA)}\x00{text}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _body_hash(text: str) -> str:
+    return hashlib.blake2b(text[:4096].encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _get_entity_cache() -> LLMCache:
+    global _entity_cache
+    if _entity_cache is None:
+        _entity_cache = LLMCache(PIONEER_CACHE_PATH, table="pioneer_entities")
+    return _entity_cache
+
+
+def _call_pioneer(texts: list[str]) -> list[list[dict]]:
+    """Call Pioneer for each text concurrently, preserving input order."""
+    if not texts:
+        return []
+    workers = max(1, min(MAX_PIONEER_WORKERS, len(texts)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda t: pioneer_extract(ENRICHER_MODEL_ID, t, ENRICHER_SCHEMA), texts))
+
+
+def _extract_entities(texts: list[str]) -> list[list[dict]]:
+    """
+    Run Pioneer entity extraction for a batch of texts.
+
+    Requests go out concurrently (up to MAX_PIONEER_WORKERS). With
+    PIONEER_CACHE=1, cached results are bulk-fetched first, only the
+    misses go to Pioneer, and new non-empty results are written back in
+    one executemany.
+    """
+    if not PIONEER_CACHE_ENABLED:
+        return _call_pioneer(texts)
+
+    cache = _get_entity_cache()
+    keys = [_entity_key(text) for text in texts]
+    cached = cache.get_many(keys)
+
+    misses = [i for i, key in enumerate(keys) if key not in cached]
+    fetched = _call_pioneer([texts[i] for i in misses])
+
+    results: list[list[dict]] = [
+        json.loads(cached[key]) if key in cached else [] for key in keys
+    ]
+    fresh: dict[str, str] = {}
+    for i, entities in zip(misses, fetched):
+        results[i] = entities
+        if entities:
+            fresh[keys[i]] = json.dumps(entities)
+
+    cache.set_many(fresh)
+    return results
+
+
 def enrich_content_node(state: GraphState) -> dict:
     """
     Enrich extracted articles with structured entity data via Pioneer AI.
@@ -75,45 +166,82 @@ def enrich_content_node(state: GraphState) -> dict:
         state: Current graph state containing raw_content with article text
 
     Returns:
-        Dictionary with enriched raw_content (each source gains an 'entities' field)
+        Dictionary with enriched raw_content (each source gains an 'entities' field),
+        the body hashes enriched so far, and whether any entities were found
     """
-    print("--- ENRICHING WITH PIONEER AI ---")
+    logger.info("--- ENRICHING WITH PIONEER AI ---")
 
     enriched_content = []
     total_entities = 0
     failed_sources = 0
+    seen_hashes = state.get("seen_hashes") or set()
 
+    # Entities already computed in earlier iterations, by body hash
+    known: dict[str, dict] = {}
+    for topic_data in state.get("raw_content", []):
+        for source in topic_data.get("sources", []):
+            text = source.get("content", "")
+            if "entities" in source and text:
+                digest = _body_hash(text)
+                if digest in seen_hashes:
+                    known[digest] = source["entities"]
+
+    # Collect every new body that needs Pioneer, then resolve them as one batch
+    pending: list[tuple[dict, str, str]] = []
+    duplicates: list[tuple[dict, str]] = []
+    queued: set[str] = set()
+    reused = 0
     for topic_data in state.get("raw_content", []):
         for source in topic_data.get("sources", []):
             text = source.get("content", "")
             if not text or len(text) < 20:
                 source["entities"] = {}
                 continue
+            digest = _body_hash(text)
+            if digest in known:
+                source["entities"] = known[digest]
+                reused += 1
+            elif digest in queued:
+                duplicates.append((source, digest))
+            else:
+                queued.add(digest)
+                pending.append((source, digest, _sanitize_for_pioneer(text)))
 
-            clean = _sanitize_for_pioneer(text)
-            truncated = clean[:4000]
-            entities = pioneer_extract(ENRICHER_MODEL_ID, truncated, ENRICHER_SCHEMA)
+        enriched_content.append(topic_data)
 
-            if not entities and len(clean) > 50:
-                failed_sources += 1
-                title = source.get("title", "unknown")[:80]
-                print(f"  ! No entities for: {title}")
+    if reused or duplicates:
+        logger.info("  -> Reusing entities for %s duplicate or already-enriched source(s)", reused + len(duplicates))
 
-            grouped: dict[str, list[str]] = {}
-            for entity in entities:
-                label = entity.get("label", "OTHER")
-                value = entity.get("text", "")
-                if value:
-                    grouped.setdefault(label, []).append(value)
+    results = _extract_entities([clean[:4000] for _, _, clean in pending])
 
-            source["entities"] = grouped
-            count = sum(len(v) for v in grouped.values())
-            total_entities += count
+    by_hash: dict[str, dict] = {}
+    for (source, digest, clean), entities in zip(pending, results):
+        if not entities and len(clean) > 50:
+            failed_sources += 1
+            title = source.get("title", "unknown")[:80]
+            logger.debug("  ! No entities for: %s", title)
 
-        enriched_content.append(topic_data)
+        grouped: dict[str, list[str]] = {}
+        for entity in entities:
+            label = entity.get("label", "OTHER")
+            value = entity.get("text", "")
+            if value:
+                grouped.setdefault(label, []).append(value)
+
+        source["entities"] = grouped
+        by_hash[digest] = grouped
+        count = sum(len(v) for v in grouped.values())
+        total_entities += count
+
+    for source, digest in duplicates:
+        source["entities"] = by_hash[digest]
 
-    print(f"  -> Extracted {total_entities} entities across all articles")
+    logger.info("  -> Extracted %s entities across all articles", total_entities)
     if failed_sources:
-        print(f"  -> {failed_sources} source(s) returned no entities (403 or empty)")
+        logger.info("  -> %s source(s) returned no entities (403 or empty)", failed_sources)
 
-    return {"raw_content": enriched_content}
+    return {
+        "raw_content": enriched_content,
+        "seen_hashes": queued | set(known),
+        "entities_present": total_entities > 0 or any(known.values()),
+    }
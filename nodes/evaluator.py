@@ -2,33 +2,152 @@
 Evaluator node - assesses coverage quality and decides if more search is needed.
 Uses OpenAI for evaluation (Pioneer evaluator model pending fix).
 """
+import logging
 import os
-from datetime import datetime
+import re
+from datetime import date, datetime
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
 
-from dotenv import load_dotenv
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 from models import GraphState, Evaluation, MAX_SEARCH_ITERATIONS
+from nodes.llm_cache import cached_structured_invoke
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-model = ChatOpenAI(model="gpt-5-mini-2025-08-07", temperature=0.0)
+# Created on first use (see _model) so importing the module builds no client
+model: ChatOpenAI | None = None
 
 
-def _is_within_range(pub_date_str: str, start: str, end: str) -> bool:
-    """Check if a published_date falls within [start, end]."""
-    if not pub_date_str:
-        return True
-    try:
-        pub = parsedate_to_datetime(pub_date_str).date()
-        return (
-            datetime.strptime(start, "%Y-%m-%d").date()
-            <= pub
-            <= datetime.strptime(end, "%Y-%m-%d").date()
+def _model() -> ChatOpenAI:
+    """Return the module chat model, creating it on first call."""
+    global model
+    if model is None:
+        # Same prompt-cache routing as the analyst: the static SYSTEM_PROMPT prefix is
+        # shared by every evaluator call, only the user message varies.
+        model = ChatOpenAI(
+            model="gpt-5-mini-2025-08-07",
+            temperature=0.0,
+            model_kwargs={"prompt_cache_key": "newsloop-evaluator"},
         )
+    return model
+
+
+# Deterministic version of the rubric's SUFFICIENT bar: when it already
+# holds, the LLM call is skipped
+MIN_SOLID_TOPICS = 3
+MAX_OUT_OF_RANGE_RATIO = 0.2
+# A concrete figure is a money amount, a percentage, or a scaled quantity;
+# bare digits (dates, years, list numbers) don't count
+_FIGURE_RE = re.compile(
+    r"[$€£¥]\s?\d"
+    r"|\d(?:[\d,.]*\d)?\s?(?:%|percent\b|por ciento\b"
+    r"|(?:million|billion|trillion|millones|billones)\b)",
+    re.IGNORECASE,
+)
+
+# Budget for the COLLECTED CONTENT block; the TOTAL line still counts everything
+MAX_SUMMARY_CHARS = 20000
+
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+# Static rubric first (system message) so the provider can cache the prefix;
+# the collected content for this run follows in the user message.
+SYSTEM_PROMPT = """You are a senior news editor evaluating coverage quality.
+
+The user provides the report objective, the required period, the search
+iteration count, and the content collected so far.
+
+EVALUATE RIGOROUSLY:
+1. TOPIC COVERAGE: Do the topics cover the sub-topics of the objective? (e.g., if the objective mentions multiple areas, there should be at least one topic per area)
+2. DATA QUALITY: Are there concrete figures (amounts, percentages, specific companies)? A topic without hard data is weak.
+3. SOURCE DIVERSITY: Are there at least 2 distinct sources per topic? A topic with only 1 source is weak. Analyzed videos count as additional coverage sources.
+4. TIMELINESS: If there are sources outside the date range, that reduces quality. Penalize proportionally.
+
+SUFFICIENCY CRITERIA:
+- SUFFICIENT: >= 3 solid topics (with concrete data + >= 2 sources each) covering the objective's sub-areas
+- INSUFFICIENT: < 3 solid topics, OR a sub-area of the objective without coverage, OR majority of sources out of range
+
+If coverage is insufficient AND iterations remain, suggest 1-2 additional focused searches for what's missing.
+If max iterations reached, mark is_sufficient=True.
+"""
+
+
+def _parse_day(value: str) -> date | None:
+    """Parse a YYYY-MM-DD bound, or None if missing/invalid."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
     except (ValueError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_published(pub_date_str: str) -> date | None:
+    """
+    Parse a source published_date to a date, or None if unparseable.
+
+    ISO dates (YYYY-MM-DD...) and Tavily's usual RFC 2822 shape
+    ("Tue, 27 Jan 2026 10:00:00 GMT") are sliced directly; anything else
+    goes through the full RFC 2822 parser. Memoized because the same
+    published_date string repeats across sources and evaluator passes.
+    """
+    try:
+        if pub_date_str[:4].isdigit() and pub_date_str[4:5] == "-":
+            return date.fromisoformat(pub_date_str[:10])
+        if pub_date_str[3:5] == ", " and pub_date_str[7:8] == " " and pub_date_str[11:12] == " ":
+            month = _MONTHS.get(pub_date_str[8:11])
+            if month is not None:
+                return date(int(pub_date_str[12:16]), month, int(pub_date_str[5:7]))
+        return parsedate_to_datetime(pub_date_str).date()
+    except (ValueError, TypeError):
+        return None
+
+
+def _is_within_range(pub_date_str: str, start: date, end: date) -> bool:
+    """
+    Check if a published_date falls within [start, end].
+
+    Missing or unparseable dates count as in range.
+    """
+    if not pub_date_str:
         return True
+    pub = _parse_published(pub_date_str)
+    return pub is None or start <= pub <= end
+
+
+def _is_solid_topic(sources: list[dict]) -> bool:
+    """A topic with >= 2 sources where at least one source has concrete figures."""
+    return len(sources) >= 2 and any(_FIGURE_RE.search(s.get("content", "")) for s in sources)
+
+
+def _summarize_topics(raw_content: list[dict]) -> str:
+    """
+    Per-topic source listing for the prompt, capped at MAX_SUMMARY_CHARS.
+
+    Only the first 3 sources of each topic are listed. Topics past the
+    budget are counted in a trailing "... and N more topics" line instead
+    of being formatted.
+    """
+    blocks = []
+    used = 0
+    for item in raw_content:
+        if used > MAX_SUMMARY_CHARS:
+            break
+        block = f"Topic: {item['topic']}\nSources:\n" + "\n".join(
+            f"  - [{s.get('published_date', 'no date')}] {s['title'][:100]}"
+            for s in item["sources"][:3]
+        )
+        blocks.append(block)
+        used += len(block) + 2
+    hidden = len(raw_content) - len(blocks)
+    if hidden:
+        blocks.append(f"... and {hidden} more topics")
+    return "\n\n".join(blocks)
 
 
 def evaluator_node(state: GraphState) -> dict:
@@ -41,7 +160,7 @@ def evaluator_node(state: GraphState) -> dict:
     Returns:
         Dictionary with Evaluation result
     """
-    print("--- EVALUATING COVERAGE ---")
+    logger.info("--- EVALUATING COVERAGE ---")
 
     objective = state.get("objective", "general news")
     context = state.get("context", "")
@@ -50,73 +169,93 @@ def evaluator_node(state: GraphState) -> dict:
     start_date = state.get("start_date", "")
     end_date = state.get("end_date", "")
 
-    topics_covered = [item["topic"] for item in raw_content]
+    # Parse the window once, not per source; without both bounds nothing is out of range
+    start_day = _parse_day(start_date)
+    end_day = _parse_day(end_date)
+    check_range = start_day is not None and end_day is not None
 
+    # One pass collects every deterministic signal
     total_sources = 0
     out_of_range = 0
+    solid_topics = 0
     for item in raw_content:
-        for source in item.get("sources", []):
-            total_sources += 1
-            pub = source.get("published_date", "")
-            if pub and not _is_within_range(pub, start_date, end_date):
-                out_of_range += 1
+        sources = item.get("sources", [])
+        total_sources += len(sources)
+        if check_range:
+            for source in sources:
+                pub = source.get("published_date", "")
+                if pub and not _is_within_range(pub, start_day, end_day):
+                    out_of_range += 1
+        if _is_solid_topic(sources):
+            solid_topics += 1
 
     if out_of_range:
-        print(f"  -> Sources out of range: {out_of_range}/{total_sources}")
+        logger.info("  -> Sources out of range: %s/%s", out_of_range, total_sources)
 
-    content_summary = []
-    for item in raw_content:
-        sources_text = "\n".join([
-            f"  - [{s.get('published_date', 'no date')}] {s['title'][:100]}"
-            for s in item["sources"][:3]
-        ])
-        content_summary.append(f"Topic: {item['topic']}\nSources:\n{sources_text}")
-
-    content_text = "\n\n".join(content_summary)
+    # No retry can follow at the limit, so the rubric would mark it sufficient anyway
+    if current_iterations >= MAX_SEARCH_ITERATIONS:
+        logger.info("  -> Evaluation: SUFFICIENT (iteration limit %s, LLM skipped)", MAX_SEARCH_ITERATIONS)
+        return {"evaluation": Evaluation(
+            is_sufficient=True,
+            missing_topics=[],
+            reasoning=(
+                f"Iteration limit reached ({current_iterations} of {MAX_SEARCH_ITERATIONS}); "
+                f"{out_of_range}/{total_sources} sources out of range."
+            ),
+        )}
+
+    # Only skip the model when every planned topic came back; otherwise the
+    # LLM must name what is missing so actualizador_topics can retry it
+    covered = {item.get("topic") for item in raw_content}
+    all_planned_present = all(topic in covered for topic in state.get("topics", []))
+
+    if (
+        all_planned_present
+        and solid_topics >= MIN_SOLID_TOPICS
+        and out_of_range < MAX_OUT_OF_RANGE_RATIO * max(total_sources, 1)
+    ):
+        logger.info("  -> Evaluation: SUFFICIENT (%s solid topics, LLM skipped)", solid_topics)
+        return {"evaluation": Evaluation(
+            is_sufficient=True,
+            missing_topics=[],
+            reasoning=(
+                f"Deterministic check: all planned topics present, {solid_topics} with >= 2 "
+                f"sources and concrete figures; {out_of_range}/{total_sources} sources out of range."
+            ),
+        )}
+
+    content_text = _summarize_topics(raw_content)
 
     # Video branch: append analyzed video summaries as additional coverage signal
     visual_analysis = state.get("visual_analysis", [])
     video_text = ""
     if visual_analysis:
-        video_text = f"\n\nANALYZED VIDEO CONTENT ({len(visual_analysis)} videos):\n"
-        for va in visual_analysis:
-            video_text += f"- Video: {va['video_title'][:80]}\n  Analysis: {va['analysis'][:200]}...\n"
+        video_text = f"\n\nANALYZED VIDEO CONTENT ({len(visual_analysis)} videos):\n" + "".join(
+            f"- Video: {va['video_title'][:80]}\n  Analysis: {va['analysis'][:200]}...\n"
+            for va in visual_analysis
+        )
 
     context_block = f"\nResearch context/focus: {context}\n" if context else ""
 
-    prompt = f"""You are a senior news editor evaluating coverage quality.
-
-REPORT OBJECTIVE: {objective}
+    user_prompt = f"""REPORT OBJECTIVE: {objective}
 {context_block}REQUIRED PERIOD: {start_date} to {end_date}
 SEARCH ITERATIONS: {current_iterations} of {MAX_SEARCH_ITERATIONS} max
 
 COLLECTED CONTENT:
 {content_text}{video_text}
 
-TOTAL: {len(topics_covered)} topics, {total_sources} sources
+TOTAL: {len(raw_content)} topics, {total_sources} sources
 SOURCES OUT OF DATE RANGE: {out_of_range} of {total_sources}
-
-EVALUATE RIGOROUSLY:
-1. TOPIC COVERAGE: Do the topics cover the sub-topics of the objective? (e.g., if the objective mentions multiple areas, there should be at least one topic per area)
-2. DATA QUALITY: Are there concrete figures (amounts, percentages, specific companies)? A topic without hard data is weak.
-3. SOURCE DIVERSITY: Are there at least 2 distinct sources per topic? A topic with only 1 source is weak. Analyzed videos count as additional coverage sources.
-4. TIMELINESS: If there are sources outside the date range, that reduces quality. Penalize proportionally.
-
-SUFFICIENCY CRITERIA:
-- SUFFICIENT: >= 3 solid topics (with concrete data + >= 2 sources each) covering the objective's sub-areas
-- INSUFFICIENT: < 3 solid topics, OR a sub-area of the objective without coverage, OR majority of sources out of range
-
-If coverage is insufficient AND iterations remain, suggest 1-2 additional focused searches for what's missing.
-If max iterations reached, mark is_sufficient=True.
 """
+    prompt = [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=user_prompt)]
 
-    evaluation = model.with_structured_output(Evaluation).invoke(prompt)
+    evaluation = cached_structured_invoke(_model(), Evaluation, prompt)
 
     status = "SUFFICIENT" if evaluation.is_sufficient else "NEEDS MORE"
-    print(f"  -> Evaluation: {status}")
+    logger.info("  -> Evaluation: %s", status)
     if not evaluation.is_sufficient and evaluation.missing_topics:
         topics_str = str(evaluation.missing_topics).encode("ascii", "replace").decode()
-        print(f"  -> Missing topics: {topics_str}")
+        logger.info("  -> Missing topics: %s", topics_str)
 
     return {"evaluation": evaluation}
 
@@ -141,10 +280,10 @@ def should_search_more(state: GraphState) -> str:
         return "analista"
 
     if current_iterations >= MAX_SEARCH_ITERATIONS:
-        print(f"  -> Iteration limit reached ({MAX_SEARCH_ITERATIONS})")
+        logger.info("  -> Iteration limit reached (%s)", MAX_SEARCH_ITERATIONS)
         return "analista"
 
     if evaluation.missing_topics:
-        print(f"  -> Searching {len(evaluation.missing_topics)} additional topics")
+        logger.info("  -> Searching %s additional topics", len(evaluation.missing_topics))
 
     return "buscador"
@@ -1,17 +1,29 @@
 """
 Explorer node - performs broad, fast searches to discover what's happening.
 """
+import logging
 import os
 
-from dotenv import load_dotenv
 from tavily import TavilyClient
 
 from models import GraphState
+from nodes.tavily_session import tavily_session
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Initialize Tavily client
-tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+# The planner shows this much of each snippet; nothing longer is kept in state
+SNIPPET_CHARS = 200
+
+# Created on first use so importing the module needs no API key or client setup
+tavily: TavilyClient | None = None
+
+
+def _tavily() -> TavilyClient:
+    """Return the module Tavily client, creating it on first call."""
+    global tavily
+    if tavily is None:
+        tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"), session=tavily_session)
+    return tavily
 
 
 def explorer_node(state: GraphState) -> dict:
@@ -28,7 +40,7 @@ def explorer_node(state: GraphState) -> dict:
     Returns:
         Dictionary with exploration_results (headlines and snippets)
     """
-    print("--- EXPLORING NEWS ---")
+    logger.info("--- EXPLORING NEWS ---")
 
     objective = state.get("objective", "general news")
     start_date = state["start_date"]
@@ -36,9 +48,9 @@ def explorer_node(state: GraphState) -> dict:
 
     # Build exploration query from objective; include date range so Tavily prioritizes the period
     exploration_query = f"{objective} news {start_date} to {end_date}"
-    print(f"  -> Exploring: {exploration_query}")
+    logger.info("  -> Exploring: %s", exploration_query)
 
-    response = tavily.search(
+    response = _tavily().search(
         query=exploration_query,
         search_depth="advanced",
         start_date=state["start_date"],
@@ -52,11 +64,11 @@ def explorer_node(state: GraphState) -> dict:
         {
             "title": result.get("title", ""),
             "url": result.get("url", ""),
-            "snippet": result.get("content", "")[:500],
+            "snippet": result.get("content", "")[:SNIPPET_CHARS],
         }
         for result in response.get("results", [])
     ]
 
-    print(f"  -> Found {len(exploration_results)} articles to analyze")
+    logger.info("  -> Found %s articles to analyze", len(exploration_results))
 
     return {"exploration_results": exploration_results}
@@ -1,56 +1,121 @@
 """
 Extractor node - extracts full content from discovered URLs.
+
+URLs from all topics are pooled and sent to Tavily extract in batches
+of up to EXTRACT_BATCH_SIZE (usually a single request). Results are
+mapped back to each topic's sources by URL. When there are several
+batches they run concurrently on a small, bounded thread pool because
+the work is network-bound. URLs already extracted in an earlier loop
+iteration (seen_urls) are not sent again; sources that re-surface
+them get the content already extracted for that URL instead.
 """
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-from dotenv import load_dotenv
 from tavily import TavilyClient
 
 from models import GraphState
+from nodes.tavily_session import tavily_session
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Initialize Tavily client
-tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+# Created on first use so importing the module needs no API key or client setup
+tavily: TavilyClient | None = None
 
 
-def extract_content_node(state: GraphState) -> dict:
-    """
-    Extract full content from URLs discovered during search.
+def _tavily() -> TavilyClient:
+    """Return the module Tavily client, creating it on first call."""
+    global tavily
+    if tavily is None:
+        tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"), session=tavily_session)
+    return tavily
 
-    Args:
-        state: Current graph state containing raw_content with URLs
 
-    Returns:
-        Dictionary with enriched raw_content
-    """
-    print("--- EXTRACTING CONTENT ---")
+# Max concurrent Tavily extract requests
+MAX_EXTRACT_WORKERS = int(os.getenv("MAX_EXTRACT_WORKERS", "8"))
 
-    enriched_content = []
+# Tavily extract accepts at most 20 URLs per request
+EXTRACT_BATCH_SIZE = 20
 
-    for topic_data in state["raw_content"]:
-        urls = [source["url"] for source in topic_data["sources"]]
 
-        if not urls:
-            enriched_content.append(topic_data)
-            continue
+def _extract_batch(urls: list[str]) -> dict:
+    """
+    Run one Tavily extract request.
 
-        try:
-            extract_response = tavily.extract(urls)
+    Args:
+        urls: Up to EXTRACT_BATCH_SIZE URLs
 
-            # Enrich sources with extracted content
-            for source in topic_data["sources"]:
-                for extracted in extract_response.get("results", []):
-                    if source["url"] == extracted["url"]:
-                        source["content"] = extracted.get("raw_content", source["content"])[:3000]
+    Returns:
+        The Tavily response, or an empty one if the request failed
+        (those sources keep their search snippet)
+    """
+    try:
+        return _tavily().extract(urls)
+    except Exception as e:
+        logger.warning("  ! Extraction error: %s", e)
+        return {"results": [], "failed_results": []}
 
-            # Remove failed extractions
-            failed_urls = [f["url"] for f in extract_response.get("failed_results", [])]
-            topic_data["sources"] = [s for s in topic_data["sources"] if s["url"] not in failed_urls]
 
-        except Exception as e:
-            print(f"  ! Extraction error: {e}")
+def extract_content_node(state: GraphState) -> dict:
+    """
+    Extract full content from URLs discovered during search.
 
-        enriched_content.append(topic_data)
+    Args:
+        state: Current graph state containing raw_content with URLs
 
-    return {"raw_content": enriched_content}
+    Returns:
+        Dictionary with enriched raw_content and the URLs now seen
+    """
+    logger.info("--- EXTRACTING CONTENT ---")
+
+    topics = state["raw_content"]
+    if not topics:
+        return {"raw_content": []}
+
+    seen_urls = state.get("seen_urls") or set()
+    # dict.fromkeys dedupes URLs shared by several topics while keeping order
+    urls = list(dict.fromkeys(
+        source["url"]
+        for topic_data in topics
+        for source in topic_data["sources"]
+        if source["url"] not in seen_urls
+    ))
+    # Content extracted in earlier iterations, by URL. A re-found source only
+    # carries its search snippet, so the longest copy is the extracted one.
+    known_content: dict[str, str] = {}
+    for topic_data in topics:
+        for source in topic_data["sources"]:
+            url = source["url"]
+            if url in seen_urls and len(source["content"]) > len(known_content.get(url, "")):
+                known_content[url] = source["content"]
+    skipped = sum(1 for t in topics for s in t["sources"] if s["url"] in seen_urls)
+    if skipped:
+        logger.info("  -> Reusing content for %s already-extracted source(s)", skipped)
+
+    batches = [urls[i:i + EXTRACT_BATCH_SIZE] for i in range(0, len(urls), EXTRACT_BATCH_SIZE)]
+    if len(batches) <= 1:
+        responses = [_extract_batch(batch) for batch in batches]
+    else:
+        workers = max(1, min(MAX_EXTRACT_WORKERS, len(batches)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            responses = list(pool.map(_extract_batch, batches))
+
+    extracted_by_url: dict[str, dict] = {}
+    failed_urls: set[str] = set()
+    for response in responses:
+        for extracted in response.get("results", []):
+            extracted_by_url[extracted["url"]] = extracted
+        failed_urls.update(f["url"] for f in response.get("failed_results", []))
+
+    for topic_data in topics:
+        for source in topic_data["sources"]:
+            extracted = extracted_by_url.get(source["url"])
+            if extracted is not None:
+                source["content"] = extracted.get("raw_content", source["content"])[:3000]
+            elif source["url"] in known_content:
+                source["content"] = known_content[source["url"]]
+        # Remove failed extractions
+        topic_data["sources"] = [s for s in topic_data["sources"] if s["url"] not in failed_urls]
+
+    return {"raw_content": topics, "seen_urls": set(urls)}
@@ -0,0 +1,201 @@
+"""
+Prompt cache for structured LLM calls (planner, evaluator, analyst).
+
+LLMCache is also reused by the enricher to keep Pioneer entity results
+(see PIONEER_CACHE in nodes/enricher.py).
+
+Keys are sha256(model + output schema name and JSON schema + prompt text),
+so changing a model's fields invalidates its old rows; callers may pass a
+normalized key_text instead of the prompt (the planner does, so reruns
+with the same leading headlines share a plan). Lookups go through
+a bounded in-process LRU first, then a SQLite file so restarts stay warm:
+
+  .cache/llm.sqlite  ->  llm_cache(key TEXT PRIMARY KEY, value TEXT)
+
+Values are the structured output serialized with Pydantic and rebuilt
+with model_validate_json on a hit; a row that no longer validates is
+treated as a miss and overwritten. Disabled unless LLM_CACHE=1, so tests
+and one-off runs always reach the model.
+"""
+import hashlib
+import os
+import sqlite3
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "0") == "1"
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_PATH = Path(
+    os.getenv("LLM_CACHE_PATH", Path(__file__).resolve().parent.parent / ".cache" / "llm.sqlite")
+)
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class LLMCache:
+    """Bounded LRU in memory, optionally backed by a SQLite table."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_entries: int = LLM_CACHE_SIZE,
+        table: str = "llm_cache",
+    ):
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._table = table
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                f"SELECT value FROM {self._table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._remember(key, row[0])
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self._table} (key, value) VALUES (?, ?)", (key, value)
+                )
+                self._db.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Look up several keys at once; SQLite misses are fetched in one query."""
+        found: dict[str, str] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                else:
+                    missing.append(key)
+            if missing and self._db is not None:
+                placeholders = ",".join("?" * len(missing))
+                rows = self._db.execute(
+                    f"SELECT key, value FROM {self._table} WHERE key IN ({placeholders})", missing
+                ).fetchall()
+                for key, value in rows:
+                    self._remember(key, value)
+                    found[key] = value
+        return found
+
+    def set_many(self, items: dict[str, str]) -> None:
+        """Store several entries with a single executemany + commit."""
+        if not items:
+            return
+        with self._lock:
+            for key, value in items.items():
+                self._remember(key, value)
+            if self._db is not None:
+                self._db.executemany(
+                    f"INSERT OR REPLACE INTO {self._table} (key, value) VALUES (?, ?)",
+                    list(items.items()),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+_cache: LLMCache | None = None
+
+
+def _get_cache() -> LLMCache:
+    global _cache
+    if _cache is None:
+        _cache = LLMCache(LLM_CACHE_PATH)
+    return _cache
+
+
+# (id(model), schema) -> (model, structured runnable); holding the model keeps its id unique
+_structured_runnables: dict[tuple[int, type], tuple[object, object]] = {}
+
+
+def _structured(model, schema: type[BaseModel]):
+    """model.with_structured_output(schema), built once per model and schema."""
+    key = (id(model), schema)
+    entry = _structured_runnables.get(key)
+    if entry is None or entry[0] is not model:
+        entry = (model, model.with_structured_output(schema))
+        _structured_runnables[key] = entry
+    return entry[1]
+
+
+def _prompt_text(prompt) -> str:
+    """Flatten a string prompt or a list of chat messages into cache-key text."""
+    if isinstance(prompt, str):
+        return prompt
+    return "\n".join(f"{getattr(m, 'type', '')}:{getattr(m, 'content', m)}" for m in prompt)
+
+
+@lru_cache(maxsize=None)
+def _schema_fingerprint(schema: type[BaseModel]) -> str:
+    """Schema name plus a hash of its JSON schema, computed once per class."""
+    body = json.dumps(schema.model_json_schema(), sort_keys=True)
+    return f"{schema.__name__}:{hashlib.sha256(body.encode('utf-8')).hexdigest()[:16]}"
+
+
+def cache_key(model, schema: type[BaseModel], prompt) -> str:
+    """sha256 of model id, output schema fingerprint, and prompt text."""
+    model_id = getattr(model, "model_name", "")
+    raw = f"{model_id}\x00{_schema_fingerprint(schema)}\x00{_prompt_text(prompt)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def cached_structured_invoke(model, schema: type[T], prompt, key_text: str | None = None) -> T:
+    """
+    Run model.with_structured_output(schema).invoke(prompt) through the cache.
+
+    Args:
+        model: LangChain chat model
+        schema: Pydantic model describing the structured output
+        prompt: Prompt string or list of chat messages
+        key_text: Optional normalized stand-in for the prompt in the cache
+            key, so near-identical prompts can share an entry
+
+    Returns:
+        The structured output, from cache when an identical call was seen.
+    """
+    if not LLM_CACHE_ENABLED:
+        return _structured(model, schema).invoke(prompt)
+
+    cache = _get_cache()
+    key = cache_key(model, schema, prompt if key_text is None else key_text)
+    hit = cache.get(key)
+    if hit is not None:
+        try:
+            return schema.model_validate_json(hit)
+        except ValidationError:
+            pass  # written by an older schema; recompute and overwrite below
+
+    result = _structured(model, schema).invoke(prompt)
+    cache.set(key, result.model_dump_json())
+    return result
@@ -6,14 +6,19 @@ Pioneer returns entities grouped by label:
 
 This module normalises them into a flat list:
   [{"label": "company", "text": "BYD"}, {"label": "location", "text": "Mexico"}]
+
+The inference endpoint takes one text per request, so callers fan out
+concurrently; all requests share one pooled keep-alive session.
 """
+import logging
 import os
 import time
 
+import orjson
 import requests
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 PIONEER_API_URL = "https://api.pioneer.ai/inference"
 PIONEER_API_KEY = os.getenv("PIONEER_API_KEY", "")
@@ -21,15 +26,21 @@ PIONEER_API_KEY = os.getenv("PIONEER_API_KEY", "")
 MAX_RETRIES = 3
 RETRY_BACKOFF = 3
 REQUEST_TIMEOUT = 60
+POOL_SIZE = 16
+
+# Shared session: concurrent enricher calls reuse TCP/TLS connections
+# instead of a fresh handshake per request
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE))
+_session.headers.update({
+    "X-API-Key": PIONEER_API_KEY,
+    "Content-Type": "application/json",
+})
 
 
 def _flatten_entities(grouped: dict) -> list[dict]:
     """Convert Pioneer's grouped entity format into a flat list."""
-    flat: list[dict] = []
-    for label, texts in grouped.items():
-        for text in texts:
-            flat.append({"label": label, "text": text})
-    return flat
+    return [{"label": label, "text": text} for label, texts in grouped.items() for text in texts]
 
 
 def pioneer_extract(model_id: str, text: str, schema: list[str]) -> list[dict]:
@@ -51,45 +62,45 @@ def pioneer_extract(model_id: str, text: str, schema: list[str]) -> list[dict]:
         "text": text,
         "schema": schema,
     }
-    headers = {
-        "X-API-Key": PIONEER_API_KEY,
-        "Content-Type": "application/json",
-    }
+    # Encoded once for all attempts; the session already sends Content-Type: application/json
+    request_body = orjson.dumps(payload)
 
     last_error = None
     for attempt in range(MAX_RETRIES):
         try:
-            response = requests.post(
+            response = _session.post(
                 PIONEER_API_URL,
-                headers=headers,
-                json=payload,
+                data=request_body,
                 timeout=REQUEST_TIMEOUT,
             )
 
             if response.status_code >= 500:
-                body = response.text[:300]
-                print(f"  ! Pioneer API {response.status_code} (attempt {attempt + 1}/{MAX_RETRIES}): {body}")
+                detail = response.content[:300].decode("utf-8", "replace")
+                logger.warning("  ! Pioneer API %s (attempt %s/%s): %s", response.status_code, attempt + 1, MAX_RETRIES, detail)
                 last_error = response
                 time.sleep(RETRY_BACKOFF * (2 ** attempt))
                 continue
 
             if response.status_code >= 400:
-                body = response.text[:300]
-                print(f"  ! Pioneer API {response.status_code}: {body}")
+                detail = response.content[:300].decode("utf-8", "replace")
+                logger.warning("  ! Pioneer API %s: %s", response.status_code, detail)
                 return []
 
-            data = response.json()
+            data = orjson.loads(response.content)
             entities_grouped = data.get("result", {}).get("entities", {})
             return _flatten_entities(entities_grouped)
 
         except requests.exceptions.Timeout:
-            print(f"  ! Pioneer timeout (attempt {attempt + 1}/{MAX_RETRIES})")
+            logger.warning("  ! Pioneer timeout (attempt %s/%s)", attempt + 1, MAX_RETRIES)
             last_error = None
             time.sleep(RETRY_BACKOFF * (2 ** attempt))
         except requests.exceptions.RequestException as e:
-            print(f"  ! Pioneer request error: {e}")
+            logger.warning("  ! Pioneer request error: %s", e)
+            return []
+        except orjson.JSONDecodeError as e:
+            logger.warning("  ! Pioneer returned invalid JSON: %s", e)
             return []
 
     if last_error is not None:
-        print(f"  ! Pioneer failed after {MAX_RETRIES} retries (last status: {last_error.status_code})")
+        logger.warning("  ! Pioneer failed after %s retries (last status: %s)", MAX_RETRIES, last_error.status_code)
     return []
@@ -1,16 +1,90 @@
 """
 Planner node - analyzes exploration results and decides what to search deeper.
 """
+import hashlib
+import logging
 import os
+import re
 
-from dotenv import load_dotenv
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 from models import GraphState, SearchPlan
+from nodes.llm_cache import cached_structured_invoke
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-model = ChatOpenAI(model="gpt-5-mini-2025-08-07", temperature=0.0)
+# Created on first use (see _model) so importing the module builds no client
+model: ChatOpenAI | None = None
+
+
+def _model() -> ChatOpenAI:
+    """Return the module chat model, creating it on first call."""
+    global model
+    if model is None:
+        # Same prompt-cache routing as the analyst: the static SYSTEM_PROMPT prefix is
+        # shared by every planner call, only the user message varies.
+        model = ChatOpenAI(
+            model="gpt-5-mini-2025-08-07",
+            temperature=0.0,
+            model_kwargs={"prompt_cache_key": "newsloop-planner"},
+        )
+    return model
+
+
+def warm_up() -> None:
+    """Make one max_tokens=1 call so the planner client's TLS/auth is ready."""
+    _model().invoke("ping", max_tokens=1)
+
+
+# Static instructions go first (system message) so the provider can cache the
+# prefix; per-run objective and headlines follow in the user message.
+SYSTEM_PROMPT = """You are a professional news research analyst.
+
+TASK:
+Based on the REAL headlines provided by the user, generate 3-5 specific search queries to investigate further.
+
+CRITICAL RULES FOR TOPICS:
+- Each topic must be A SHORT SEARCH QUERY (max 50-60 characters)
+- Do NOT include explanations or reasoning in the topics
+- Reasoning goes ONLY in the "reasoning" field, NOT in the topics
+- Topics are ONLY the search phrases
+
+CORRECT topic examples:
+- "AI regulation updates 2026"
+- "Tesla factory expansion Germany"
+- "Federal Reserve interest rate decision"
+- "Climate summit agreements COP31"
+
+INCORRECT topic examples (DO NOT do this):
+- "1) AI regulation as a driver... Reasoning: the headline indicates..." (TOO LONG)
+- "Search about investments in renewable energy considering that..." (TOO LONG)
+
+Prioritize news with concrete data (figures, companies, specific locations).
+"""
+
+
+# Headlines that feed the planner cache key (see _plan_cache_key)
+PLAN_KEY_HEADLINES = 5
+_NON_WORD_RE = re.compile(r"\W+")
+
+
+def _plan_cache_key(objective: str, context: str, exploration_data: list[dict]) -> str:
+    """
+    Cache-key text for a plan: prompt hash, objective, context and the top headlines.
+
+    Headlines are lowercased, stripped of punctuation and sorted, and
+    snippets are left out. Reruns whose exploration surfaces the same
+    leading stories (in any order, with different snippets or a
+    different tail) reuse the cached SearchPlan when LLM_CACHE=1. The
+    SYSTEM_PROMPT hash keeps plans from an older prompt from being reused.
+    """
+    prompt_hash = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:16]
+    headlines = sorted(
+        _NON_WORD_RE.sub(" ", item["title"].lower()).strip()
+        for item in exploration_data[:PLAN_KEY_HEADLINES]
+    )
+    return "\n".join([prompt_hash, objective.strip().lower(), context.strip().lower(), *headlines])
 
 
 def planner_node(state: GraphState) -> dict:
@@ -27,53 +101,34 @@ def planner_node(state: GraphState) -> dict:
     Returns:
         Dictionary with topics list and planning_reasoning
     """
-    print("--- PLANNING SEARCHES ---")
+    logger.info("--- PLANNING SEARCHES ---")
 
     exploration_data = state.get("exploration_results", [])
     objective = state.get("objective", "general news")
     context = state.get("context", "")
 
     headlines_text = "\n".join([
-        f"- {item['title']}: {item['snippet'][:200]}..."
+        f"- {item['title']}: {item['snippet']}..."
         for item in exploration_data
     ])
 
     context_block = f"\nContext/focus: {context}\n" if context else ""
 
-    prompt = f"""You are a professional news research analyst.
-
-REPORT OBJECTIVE: {objective}
+    user_prompt = f"""REPORT OBJECTIVE: {objective}
 {context_block}
 HEADLINES AND NEWS FOUND:
 {headlines_text}
-
-TASK:
-Based on the REAL headlines above, generate 3-5 specific search queries to investigate further.
-
-CRITICAL RULES FOR TOPICS:
-- Each topic must be A SHORT SEARCH QUERY (max 50-60 characters)
-- Do NOT include explanations or reasoning in the topics
-- Reasoning goes ONLY in the "reasoning" field, NOT in the topics
-- Topics are ONLY the search phrases
-
-CORRECT topic examples:
-- "AI regulation updates 2026"
-- "Tesla factory expansion Germany"
-- "Federal Reserve interest rate decision"
-- "Climate summit agreements COP31"
-
-INCORRECT topic examples (DO NOT do this):
-- "1) AI regulation as a driver... Reasoning: the headline indicates..." (TOO LONG)
-- "Search about investments in renewable energy considering that..." (TOO LONG)
-
-Prioritize news with concrete data (figures, companies, specific locations).
 """
+    prompt = [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=user_prompt)]
 
-    plan = model.with_structured_output(SearchPlan).invoke(prompt)
+    plan = cached_structured_invoke(
+        _model(), SearchPlan, prompt,
+        key_text=_plan_cache_key(objective, context, exploration_data),
+    )
 
-    print(f"  -> Topics selected: {len(plan.topics)}")
+    logger.info("  -> Topics selected: %s", len(plan.topics))
     for i, topic in enumerate(plan.topics, 1):
-        print(f"     {i}. {topic}")
+        logger.debug("     %s. %s", i, topic)
 
     return {
         "topics": plan.topics,
@@ -1,41 +1,54 @@
 """
 Searcher node - performs deep, targeted news searches.
 """
+import logging
 import os
 
-from dotenv import load_dotenv
 from tavily import TavilyClient
 
 from models import GraphState
+from nodes.tavily_session import tavily_session
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Initialize Tavily client
-tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+# Created on first use so importing the module needs no API key or client setup
+tavily: TavilyClient | None = None
+
+
+def _tavily() -> TavilyClient:
+    """Return the module Tavily client, creating it on first call."""
+    global tavily
+    if tavily is None:
+        tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"), session=tavily_session)
+    return tavily
 
 
 def search_news_node(state: GraphState) -> dict:
     """
     Search news for all topics with deep, targeted queries.
 
+    In the graph this node is dispatched once per topic (see
+    agent.dispatch_searches), so each invocation usually carries a
+    single topic and returns only its own results.
+
     Args:
         state: Current graph state containing topics and date range
 
     Returns:
         Dictionary with raw_content and incremented search_iterations
     """
-    print("--- SEARCHING NEWS ---")
+    logger.info("--- SEARCHING NEWS ---")
 
-    raw_content = state.get("raw_content", [])
+    raw_content = list(state.get("raw_content", []))
     current_iterations = state.get("search_iterations", 0)
     start_date = state["start_date"]
     end_date = state["end_date"]
 
     for topic in state["topics"]:
         enhanced_query = f"{topic} news {start_date} {end_date}"
-        print(f"  -> Searching: {enhanced_query}")
+        logger.info("  -> Searching: %s", enhanced_query)
 
-        response = tavily.search(
+        response = _tavily().search(
             query=enhanced_query,
             search_depth="advanced",
             start_date=start_date,
@@ -54,7 +67,8 @@ def search_news_node(state: GraphState) -> dict:
             for result in response.get("results", [])
         ]
 
-        raw_content.append({"topic": topic, "sources": sources})
+        # search_iteration lets merge_raw_content tell a retry of the same topic from an update
+        raw_content.append({"topic": topic, "sources": sources, "search_iteration": current_iterations})
 
     return {
         "raw_content": raw_content,
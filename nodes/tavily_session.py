@@ -0,0 +1,17 @@
+"""
+Shared HTTP session for the nodes' Tavily clients.
+
+Explorer, searcher, extractor and video searcher each create their own
+TavilyClient (so tests can patch them per module), but they all talk to
+api.tavily.com. Handing every client this one pooled session lets a run
+reuse keep-alive connections across nodes and concurrent workers instead
+of opening a fresh TLS connection per client.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+
+# Covers the largest fan-out (MAX_EXTRACT_WORKERS / video searches) with headroom
+POOL_SIZE = 16
+
+tavily_session = requests.Session()
+tavily_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE))
@@ -5,78 +5,130 @@ Limits: MAX_VIDEOS=5, MAX_VIDEOS_PER_TOPIC=2. Configurable via env vars.
 Search strategy:
   1. Query Tavily for each planner topic, restricted to youtube.com/youtu.be domains.
      Queries stay natural (no "video YouTube" suffix) — domain filtering does the targeting.
+     Queries run concurrently on a thread pool, in waves sized to the remaining
+     MAX_VIDEOS slots; results are merged in topic order.
   2. If strategy 1 yields no videos, fall back to 3 broad queries built from the objective
      directly (objective, objective + highlights, objective + news).
 """
+import logging
 import os
 import re
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
-from dotenv import load_dotenv
 from tavily import TavilyClient
 
 from models import GraphState
+from nodes.tavily_session import tavily_session
 
-load_dotenv()
-
-tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+logger = logging.getLogger(__name__)
 
 MAX_VIDEOS = int(os.getenv("MAX_VIDEOS", "5"))
 MAX_VIDEOS_PER_TOPIC = int(os.getenv("MAX_VIDEOS_PER_TOPIC", "2"))
 
-_YOUTUBE_DOMAINS = ["youtube.com", "youtu.be"]
+# Created on first use so importing the module needs no API key or client setup
+tavily: TavilyClient | None = None
+
+
+def _tavily() -> TavilyClient:
+    """Return the module Tavily client, creating it on first call."""
+    global tavily
+    if tavily is None:
+        tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"), session=tavily_session)
+    return tavily
+
+
+_YOUTUBE_DOMAINS = ("youtube.com", "youtu.be")
 
 YOUTUBE_PATTERN = re.compile(
     r'(?:https?://)?(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([\w-]+)'
 )
+_WATCH_URL = "https://www.youtube.com/watch?v="
 
 
-def _extract_youtube_urls(results: list[dict]) -> list[dict]:
-    videos = []
-    seen = set()
+def _iter_youtube_urls(results: list[dict]) -> Iterator[dict]:
+    """Yield unique YouTube videos from Tavily results, lazily, in result order."""
+    seen_ids: set[str] = set()
     for result in results:
         url = result.get("url", "")
         title = result.get("title", "")
         content = result.get("content", "")
+        snippet = content[:300]
 
         yt_match = YOUTUBE_PATTERN.search(url)
+        # Dedup checks compare the set size around add(): one hash probe instead of in + add
         if yt_match:
-            clean_url = f"https://www.youtube.com/watch?v={yt_match.group(1)}"
-            if clean_url not in seen:
-                seen.add(clean_url)
-                videos.append({"url": clean_url, "title": title, "snippet": content[:300], "source": "youtube"})
+            seen_before = len(seen_ids)
+            video_id = yt_match.group(1)
+            seen_ids.add(video_id)
+            if len(seen_ids) > seen_before:
+                yield {"url": _WATCH_URL + video_id, "title": title, "snippet": snippet, "source": "youtube"}
                 continue
 
-        for match in YOUTUBE_PATTERN.finditer(content):
-            clean_url = f"https://www.youtube.com/watch?v={match.group(1)}"
-            if clean_url not in seen:
-                seen.add(clean_url)
-                videos.append({"url": clean_url, "title": f"(embedded) {title}", "snippet": content[:300], "source": "embedded"})
-    return videos
+        # Every pattern match contains "youtu"; skip the regex on plain article text
+        if "youtu" not in content:
+            continue
+        embed_title = f"(embedded) {title}"
+        for video_id in YOUTUBE_PATTERN.findall(content):
+            seen_before = len(seen_ids)
+            seen_ids.add(video_id)
+            if len(seen_ids) > seen_before:
+                yield {"url": _WATCH_URL + video_id, "title": embed_title, "snippet": snippet, "source": "embedded"}
 
 
 def _search_youtube(query: str) -> list[dict]:
-    """Run a single Tavily search restricted to YouTube domains. Returns extracted video dicts."""
+    """
+    Run a single Tavily search restricted to YouTube domains.
+
+    Returns at most MAX_VIDEOS_PER_TOPIC extracted video dicts; results
+    after those are never regex-scanned.
+    """
     try:
-        response = tavily.search(
+        response = _tavily().search(
             query=query,
             search_depth="basic",
             max_results=5,
             topic="news",
             include_domains=_YOUTUBE_DOMAINS,
         )
-        return _extract_youtube_urls(response.get("results", []))
+        return list(islice(_iter_youtube_urls(response.get("results", [])), MAX_VIDEOS_PER_TOPIC))
     except Exception as e:
-        print(f"  ! Error searching YouTube for '{query}': {e}")
+        logger.warning("  ! Error searching YouTube for '%s': %s", query, e)
         return []
 
 
+def _search_many(queries: list[str], searched: dict[str, list[dict]]) -> list[list[dict]]:
+    """
+    Run _search_youtube concurrently for queries not already in `searched`.
+
+    Args:
+        queries: Search queries, possibly repeating each other or earlier ones
+        searched: Results by query for this node run; filled in place
+
+    Returns:
+        Found videos per query, in query order
+    """
+    pending = [q for q in dict.fromkeys(queries) if q not in searched]
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(len(pending), MAX_VIDEOS))) as pool:
+            searched.update(zip(pending, pool.map(_search_youtube, pending)))
+    return [searched[q] for q in queries]
+
+
 def video_searcher_node(state: GraphState) -> dict:
-    print(f"--- SEARCHING VIDEOS (max {MAX_VIDEOS}) ---")
+    logger.info("--- SEARCHING VIDEOS (max %s) ---", MAX_VIDEOS)
+    if MAX_VIDEOS <= 0:
+        logger.info("  -> Video search disabled (MAX_VIDEOS=%s)", MAX_VIDEOS)
+        return {"video_sources": []}
+
     topics = state.get("topics", [])
     objective = state.get("objective", "")
 
     candidate_videos: list[dict] = []
     seen_urls: set[str] = set()
+    # Repeated topics, or a broad query equal to a topic, reuse the earlier search
+    searched: dict[str, list[dict]] = {}
 
     def _add(videos: list[dict]) -> None:
         for v in videos:
@@ -84,37 +136,40 @@ def video_searcher_node(state: GraphState) -> dict:
                 seen_urls.add(v["url"])
                 candidate_videos.append(v)
 
+    def _search_until_full(queries: list[str], kind: str) -> None:
+        # Each query adds at most MAX_VIDEOS_PER_TOPIC videos, so a wave only
+        # launches as many queries as could fill the remaining slots; later
+        # queries are never searched once the cap is reached
+        i = 0
+        while i < len(queries) and len(candidate_videos) < MAX_VIDEOS:
+            slots = MAX_VIDEOS - len(candidate_videos)
+            wave = queries[i:i + -(-slots // max(MAX_VIDEOS_PER_TOPIC, 1))]
+            i += len(wave)
+            for query in wave:
+                logger.info("  -> Searching (%s): %s", kind, query)
+            for found in _search_many(wave, searched):
+                _add(found)
+                logger.debug("     Found: %s video(s)", len(found))
+
     # ------------------------------------------------------------------
-    # Strategy 1: one Tavily call per planner topic, YouTube-domain only
+    # Strategy 1: one Tavily call per planner topic, YouTube-domain only.
+    # Calls run concurrently; videos are still added in topic order.
     # ------------------------------------------------------------------
-    for topic in topics:
-        if len(candidate_videos) >= MAX_VIDEOS:
-            break
-        print(f"  -> Searching (topic): {topic}")
-        found = _search_youtube(topic)
-        _add(found[:MAX_VIDEOS_PER_TOPIC])
-        print(f"     Found: {len(found)} video(s)")
+    _search_until_full(topics, "topic")
 
     # ------------------------------------------------------------------
     # Strategy 2: fallback — broad queries from the objective itself
     # ------------------------------------------------------------------
     if not candidate_videos and objective:
-        print(f"  -> No videos from topics, trying broad queries from objective…")
-        broad_queries = [
+        logger.info("  -> No videos from topics, trying broad queries from objective…")
+        _search_until_full([
             objective,
             f"{objective} highlights",
             f"{objective} news",
-        ]
-        for query in broad_queries:
-            if len(candidate_videos) >= MAX_VIDEOS:
-                break
-            print(f"  -> Searching (broad): {query}")
-            found = _search_youtube(query)
-            _add(found[:MAX_VIDEOS_PER_TOPIC])
-            print(f"     Found: {len(found)} video(s)")
-
-    print(f"  -> Videos selected: {len(candidate_videos)}")
+        ], "broad")
+
+    logger.info("  -> Videos selected: %s", len(candidate_videos))
     for i, v in enumerate(candidate_videos, 1):
-        print(f"     {i}. {v['title'][:60]}")
+        logger.debug("     %s. %s", i, v['title'][:60])
 
     return {"video_sources": candidate_videos}
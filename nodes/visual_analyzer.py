@@ -1,70 +1,93 @@
 """
 Visual Analyzer node — uploads videos to Reka Vision API, indexes them, runs Q&A.
+
+Each video's upload → index wait → Q&A → delete pipeline is independent
+and mostly spent waiting on Reka, so videos run concurrently on a small
+thread pool (MAX_REKA_WORKERS) and their indexing waits overlap. All
+Reka calls (upload, index polls, Q&A, delete) share one pooled
+keep-alive session.
 """
+import logging
 import os
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from models import GraphState
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 REKA_API_KEY = os.getenv("REKA_API_KEY")
 VISION_BASE_URL = "https://vision-agent.api.reka.ai"
 INDEX_TIMEOUT_SECONDS = 300
-INDEX_POLL_INTERVAL = 10
+# Indexing polls back off 1s, 2s, 4s, ... up to 30s so short clips are picked up quickly
+INDEX_POLL_INITIAL = 1
+INDEX_POLL_MAX = 30
+
+# Max videos processed at once (bounded to stay within Reka rate limits)
+MAX_REKA_WORKERS = int(os.getenv("MAX_REKA_WORKERS", "4"))
+
+# Shared session: every poll and call reuses TCP/TLS connections instead of
+# a fresh handshake per request. Retry only covers idempotent methods
+# (index polls and deletes), never the upload or Q&A POSTs.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=max(MAX_REKA_WORKERS, 1),
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+))
+_session.headers.update({"X-Api-Key": REKA_API_KEY})
 
 
 def _upload_video(url: str, name: str) -> str | None:
-    headers = {"X-Api-Key": REKA_API_KEY}
     try:
-        response = requests.post(
+        response = _session.post(
             f"{VISION_BASE_URL}/v1/videos/upload",
-            headers=headers,
             data={"video_url": url, "video_name": name, "index": True},
             timeout=60,
         )
         response.raise_for_status()
         video_id = response.json().get("video_id")
-        print(f"    Uploaded: {video_id}")
+        logger.debug("    Uploaded: %s", video_id)
         return video_id
     except Exception as e:
-        print(f"    ! Error uploading video: {e}")
+        logger.warning("    ! Error uploading video: %s", e)
         return None
 
 
 def _wait_for_indexing(video_id: str) -> bool:
-    headers = {"X-Api-Key": REKA_API_KEY}
     elapsed = 0
+    delay = INDEX_POLL_INITIAL
     while elapsed < INDEX_TIMEOUT_SECONDS:
         try:
-            resp = requests.get(f"{VISION_BASE_URL}/v1/videos/{video_id}", headers=headers, timeout=15)
+            resp = _session.get(f"{VISION_BASE_URL}/v1/videos/{video_id}", timeout=15)
             data = resp.json()
             status = data.get("indexing_status", "pending")
             if status == "indexed":
-                print(f"    Indexed ✓")
+                logger.debug("    Indexed ✓")
                 return True
             elif status == "failed":
-                print(f"    ! Indexing failed. Full API response: {data}")
+                logger.warning("    ! Indexing failed. Full API response: %s", data)
                 return False
-            elapsed += INDEX_POLL_INTERVAL
-            print(f"    Indexing... ({status}, {elapsed}s/{INDEX_TIMEOUT_SECONDS}s)", end="\r")
-            time.sleep(INDEX_POLL_INTERVAL)
+            elapsed += delay
+            logger.debug("    Indexing... (%s, %ss/%ss)", status, elapsed, INDEX_TIMEOUT_SECONDS)
+            time.sleep(delay)
+            delay = min(delay * 2, INDEX_POLL_MAX)
         except Exception as e:
-            print(f"    ! Error checking indexing status: {e}")
+            logger.warning("    ! Error checking indexing status: %s", e)
             return False
-    print(f"    ! Timeout after {INDEX_TIMEOUT_SECONDS}s")
+    logger.warning("    ! Timeout after %ss", INDEX_TIMEOUT_SECONDS)
     return False
 
 
 def _qa_video(video_id: str, objective: str, topic: str) -> str:
-    headers = {"X-Api-Key": REKA_API_KEY, "Content-Type": "application/json"}
     try:
-        resp = requests.post(
+        resp = _session.post(
             f"{VISION_BASE_URL}/v1/qa/chat",
-            headers=headers,
             json={
                 "video_id": video_id,
                 "messages": [{
@@ -86,60 +109,85 @@ def _qa_video(video_id: str, objective: str, topic: str) -> str:
         resp.raise_for_status()
         return resp.json().get("chat_response", "")
     except Exception as e:
-        print(f"    ! Error in Q&A: {e}")
+        logger.warning("    ! Error in Q&A: %s", e)
         return ""
 
 
 def _delete_video(video_id: str) -> None:
     try:
-        requests.delete(f"{VISION_BASE_URL}/v1/videos/{video_id}", headers={"X-Api-Key": REKA_API_KEY}, timeout=10)
+        _session.delete(f"{VISION_BASE_URL}/v1/videos/{video_id}", timeout=10)
     except Exception:
         pass
 
 
+def _analyze_video(i: int, total: int, video: dict, objective: str) -> dict | None:
+    """
+    Upload, index, and question one video, then delete it from Reka.
+
+    Args:
+        i: 1-based position of the video (for logs and the upload name)
+        total: Number of videos in this run
+        video: Video source dict with url, title and snippet
+        objective: Research objective passed to the Q&A prompt
+
+    Returns:
+        The visual_analysis entry, or None if any step failed
+    """
+    url = video["url"]
+    title = video.get("title", f"video_{i}")
+    topic = video.get("snippet", objective)[:200]
+
+    logger.info("\n  [%s/%s] %s", i, total, title[:60])
+    logger.debug("    URL: %s", url)
+
+    # crc32 keeps the name stable across runs (hash() is salted per process)
+    video_id = _upload_video(url, f"news_{i}_{zlib.crc32(url.encode()) & 0xFFFF:04x}")
+    if not video_id:
+        return None
+
+    if not _wait_for_indexing(video_id):
+        _delete_video(video_id)
+        return None
+
+    logger.debug("    Analyzing content...")
+    analysis = _qa_video(video_id, objective, topic)
+    _delete_video(video_id)
+
+    if not analysis:
+        logger.warning("    ! Empty analysis")
+        return None
+
+    logger.debug("    ✓ Analysis ready (%s chars)", len(analysis))
+    return {
+        "video_url": url,
+        "video_title": title,
+        "analysis": analysis,
+        "source_topic": topic[:100],
+    }
+
+
 def visual_analyzer_node(state: GraphState) -> dict:
-    print("--- ANALYZING VIDEOS (REKA VISION) ---")
+    logger.info("--- ANALYZING VIDEOS (REKA VISION) ---")
     video_sources = state.get("video_sources", [])
     objective = state.get("objective", "general news")
 
     if not video_sources:
-        print("  -> No videos to analyze")
+        logger.info("  -> No videos to analyze")
         return {"visual_analysis": []}
 
-    total = len(video_sources)
-    visual_analysis = []
-
-    for i, video in enumerate(video_sources, 1):
-        url = video["url"]
-        title = video.get("title", f"video_{i}")
-        topic = video.get("snippet", objective)[:200]
-
-        print(f"\n  [{i}/{total}] {title[:60]}")
-        print(f"    URL: {url}")
-
-        video_id = _upload_video(url, f"news_{i}_{hash(url) % 100000}")
-        if not video_id:
-            continue
-
-        if not _wait_for_indexing(video_id):
-            _delete_video(video_id)
-            continue
-
-        print(f"    Analyzing content...")
-        analysis = _qa_video(video_id, objective, topic)
-
-        if analysis:
-            visual_analysis.append({
-                "video_url": url,
-                "video_title": title,
-                "analysis": analysis,
-                "source_topic": topic[:100],
-            })
-            print(f"    ✓ Analysis ready ({len(analysis)} chars)")
-        else:
-            print(f"    ! Empty analysis")
+    # Without a key every upload would fail with a 401 after a full round-trip
+    if not REKA_API_KEY:
+        logger.warning("  -> REKA_API_KEY not set, skipping visual analysis")
+        return {"visual_analysis": []}
 
-        _delete_video(video_id)
+    total = len(video_sources)
+    workers = max(1, min(MAX_REKA_WORKERS, total))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            lambda item: _analyze_video(item[0], total, item[1], objective),
+            enumerate(video_sources, 1),
+        )
+        visual_analysis = [entry for entry in results if entry is not None]
 
-    print(f"\n  => Videos analyzed: {len(visual_analysis)}/{total}")
+    logger.info("\n  => Videos analyzed: %s/%s", len(visual_analysis), total)
     return {"visual_analysis": visual_analysis}
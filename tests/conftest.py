@@ -4,6 +4,9 @@ Shared pytest fixtures for the News Bot test suite.
 import pytest
 from unittest.mock import MagicMock, patch
 
+from langchain_openai import ChatOpenAI
+from tavily import TavilyClient
+
 from models import (
     GraphState,
     NewsDigest,
@@ -17,8 +20,11 @@ from models import (
 # =============================================================================
 # Sample Data Fixtures
 # =============================================================================
+# Read-only samples (headlines, Pydantic outputs) are built once per session.
+# raw_content and state stay per-test: the enricher writes entities into the
+# source dicts in place.
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_exploration_results():
     """Sample exploration data as returned by explorer_node."""
     return [
@@ -134,7 +140,7 @@ def sample_state(sample_exploration_results, sample_raw_content):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_digest():
     """Sample NewsDigest output."""
     return NewsDigest(
@@ -153,7 +159,7 @@ def sample_digest():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_report_output(sample_digest):
     """Sample ReportOutput wrapping a digest with metadata."""
     return ReportOutput(
@@ -165,7 +171,21 @@ def sample_report_output(sample_digest):
     )
 
 
+@pytest.fixture(scope="session")
+def sample_report_json_bytes(sample_report_output):
+    """sample_report_output serialized as indented JSON, once per session."""
+    return sample_report_output.model_dump_json(indent=2).encode("utf-8")
+
+
 @pytest.fixture
+def sample_report_json_file(tmp_path, sample_report_json_bytes):
+    """sample_report_output written to tmp_path/report.json."""
+    json_file = tmp_path / "report.json"
+    json_file.write_bytes(sample_report_json_bytes)
+    return json_file
+
+
+@pytest.fixture(scope="session")
 def sample_search_plan():
     """Sample SearchPlan from planner."""
     return SearchPlan(
@@ -178,7 +198,7 @@ def sample_search_plan():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_evaluation_sufficient():
     """Sample Evaluation marking coverage as sufficient."""
     return Evaluation(
@@ -188,7 +208,7 @@ def sample_evaluation_sufficient():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_evaluation_insufficient():
     """Sample Evaluation marking coverage as insufficient."""
     return Evaluation(
@@ -198,7 +218,7 @@ def sample_evaluation_insufficient():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_pioneer_enricher_entities():
     """Mock Pioneer entity extraction response for the enricher."""
     return [
@@ -213,7 +233,7 @@ def sample_pioneer_enricher_entities():
 # Mock Fixtures
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_tavily_search_response():
     """Mock response from Tavily search API."""
     return {
@@ -232,7 +252,7 @@ def mock_tavily_search_response():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_tavily_extract_response():
     """Mock response from Tavily extract API."""
     return {
@@ -246,6 +266,10 @@ def mock_tavily_extract_response():
     }
 
 
+# One Tavily mock for the whole session; mock_tavily resets it after each test.
+_TAVILY_MOCK = MagicMock(spec=TavilyClient)
+
+
 @pytest.fixture
 def mock_tavily(monkeypatch, mock_tavily_search_response, mock_tavily_extract_response):
     """
@@ -256,16 +280,18 @@ def mock_tavily(monkeypatch, mock_tavily_search_response, mock_tavily_extract_re
             # Tavily calls are now mocked
             result = explorer_node(state)
     """
-    mock_client = MagicMock()
-    mock_client.search.return_value = mock_tavily_search_response
-    mock_client.extract.return_value = mock_tavily_extract_response
+    _TAVILY_MOCK.search.return_value = mock_tavily_search_response
+    _TAVILY_MOCK.extract.return_value = mock_tavily_extract_response
 
-    monkeypatch.setattr("nodes.explorer.tavily", mock_client)
-    monkeypatch.setattr("nodes.searcher.tavily", mock_client)
-    monkeypatch.setattr("nodes.extractor.tavily", mock_client)
-    monkeypatch.setattr("nodes.video_searcher.tavily", mock_client)
+    monkeypatch.setattr("nodes.explorer.tavily", _TAVILY_MOCK)
+    monkeypatch.setattr("nodes.searcher.tavily", _TAVILY_MOCK)
+    monkeypatch.setattr("nodes.extractor.tavily", _TAVILY_MOCK)
+    monkeypatch.setattr("nodes.video_searcher.tavily", _TAVILY_MOCK)
 
-    return mock_client
+    yield _TAVILY_MOCK
+
+    # Tests override return values and side effects; clear those too
+    _TAVILY_MOCK.reset_mock(return_value=True, side_effect=True)
 
 
 def _make_openai_mock(
@@ -281,12 +307,17 @@ def _make_openai_mock(
     and 'pioneer_enricher' mocks.
     """
     def _build_model(return_map):
-        mock_model = MagicMock()
+        mock_model = MagicMock(spec=ChatOpenAI)
+        # One chain per output type, built up front and handed out on every call
+        chains = {
+            output_type: MagicMock(invoke=MagicMock(return_value=value))
+            for output_type, value in return_map.items()
+        }
 
         def _with_structured_output(output_type):
-            mock_chain = MagicMock()
-            mock_chain.invoke.return_value = return_map.get(output_type)
-            return mock_chain
+            if output_type not in chains:
+                chains[output_type] = MagicMock(invoke=MagicMock(return_value=None))
+            return chains[output_type]
 
         mock_model.with_structured_output = _with_structured_output
         return mock_model
@@ -305,55 +336,52 @@ def _make_openai_mock(
     }
 
 
-@pytest.fixture
-def mock_openai(
-    monkeypatch,
+@pytest.fixture(scope="session")
+def _openai_mock_sets(
     sample_search_plan,
     sample_evaluation_sufficient,
+    sample_evaluation_insufficient,
     sample_digest,
     sample_pioneer_enricher_entities,
 ):
-    """
-    Mock OpenAI for planner, evaluator, analyst + Pioneer for enricher.
+    """Mock trees keyed by evaluation outcome, built once per session."""
+    return {
+        name: _make_openai_mock(
+            sample_search_plan,
+            evaluation,
+            sample_digest,
+            sample_pioneer_enricher_entities,
+        )
+        for name, evaluation in (
+            ("sufficient", sample_evaluation_sufficient),
+            ("insufficient", sample_evaluation_insufficient),
+        )
+    }
 
-    This is the standard fixture used by most tests.
-    """
-    mocks = _make_openai_mock(
-        sample_search_plan,
-        sample_evaluation_sufficient,
-        sample_digest,
-        sample_pioneer_enricher_entities,
-    )
 
+def _patch_openai_mocks(monkeypatch, mocks):
+    """Point the nodes at a prebuilt mock tree; yields the planner model."""
     monkeypatch.setattr("nodes.planner.model", mocks["planner"])
     monkeypatch.setattr("nodes.evaluator.model", mocks["evaluator"])
     monkeypatch.setattr("nodes.analyst.model", mocks["analyst"])
     monkeypatch.setattr("nodes.enricher.pioneer_extract", mocks["pioneer_enricher"])
-
-    return mocks["planner"]
+    yield mocks["planner"]
+    mocks["pioneer_enricher"].reset_mock()
 
 
 @pytest.fixture
-def mock_openai_insufficient(
-    monkeypatch,
-    sample_search_plan,
-    sample_evaluation_insufficient,
-    sample_digest,
-    sample_pioneer_enricher_entities,
-):
+def mock_openai(monkeypatch, _openai_mock_sets):
     """
-    Mock that returns insufficient evaluation (triggers re-search loop).
+    Mock OpenAI for planner, evaluator, analyst + Pioneer for enricher.
+
+    This is the standard fixture used by most tests.
     """
-    mocks = _make_openai_mock(
-        sample_search_plan,
-        sample_evaluation_insufficient,
-        sample_digest,
-        sample_pioneer_enricher_entities,
-    )
+    yield from _patch_openai_mocks(monkeypatch, _openai_mock_sets["sufficient"])
 
-    monkeypatch.setattr("nodes.planner.model", mocks["planner"])
-    monkeypatch.setattr("nodes.evaluator.model", mocks["evaluator"])
-    monkeypatch.setattr("nodes.analyst.model", mocks["analyst"])
-    monkeypatch.setattr("nodes.enricher.pioneer_extract", mocks["pioneer_enricher"])
 
-    return mocks["planner"]
+@pytest.fixture
+def mock_openai_insufficient(monkeypatch, _openai_mock_sets):
+    """
+    Mock that returns insufficient evaluation (triggers re-search loop).
+    """
+    yield from _patch_openai_mocks(monkeypatch, _openai_mock_sets["insufficient"])
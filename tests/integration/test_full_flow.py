@@ -4,8 +4,23 @@ Integration tests for the complete News Bot agent flow.
 import pytest
 from unittest.mock import patch, MagicMock
 
-from agent import run_agent, save_report, app
-from models import GraphState, NewsDigest, ReportOutput, SearchPlan, Evaluation, MAX_SEARCH_ITERATIONS
+from agent import run_agent, save_report, app, dispatch_searches, initial_state
+from models import merge_raw_content, NewsDigest, ReportOutput, SearchPlan, Evaluation, MAX_SEARCH_ITERATIONS
+
+
+@pytest.fixture
+def traced_app(monkeypatch):
+    """Record the name of every node app.stream emits; returns the list."""
+    nodes_called = []
+    original_stream = app.stream
+
+    def tracking_stream(inputs, **kwargs):
+        for output in original_stream(inputs, **kwargs):
+            nodes_called.extend(output.keys())
+            yield output
+
+    monkeypatch.setattr(app, "stream", tracking_stream)
+    return nodes_called
 
 
 class TestFullAgentFlow:
@@ -23,24 +38,13 @@ class TestFullAgentFlow:
         assert isinstance(digest, NewsDigest)
         assert len(digest.sections) > 0
 
-    def test_flow_calls_all_nodes_in_order(self, mock_tavily, mock_openai):
+    def test_flow_calls_all_nodes_in_order(self, mock_tavily, mock_openai, traced_app):
         """Test that all nodes are executed in the correct order."""
-        nodes_called = []
-
-        original_stream = app.stream
-
-        def tracking_stream(inputs):
-            for output in original_stream(inputs):
-                for key in output.keys():
-                    nodes_called.append(key)
-                yield output
-
-        with patch.object(app, 'stream', tracking_stream):
-            run_agent(
-                objective="Test",
-                start_date="2026-01-20",
-                end_date="2026-02-03"
-            )
+        run_agent(
+            objective="Test",
+            start_date="2026-01-20",
+            end_date="2026-02-03"
+        )
 
         expected_sequence = [
             "explorador",
@@ -54,7 +58,7 @@ class TestFullAgentFlow:
             "analista",
         ]
         for expected_node in expected_sequence:
-            assert expected_node in nodes_called, f"Node {expected_node} was not called"
+            assert expected_node in traced_app, f"Node {expected_node} was not called"
 
     def test_flow_handles_empty_exploration(self, mock_tavily, mock_openai):
         """Test flow handles case where exploration returns nothing."""
@@ -103,26 +107,27 @@ class TestConditionalLoop:
 
         assert search_iterations[0] <= MAX_SEARCH_ITERATIONS + 1
 
-    def test_actualizador_updates_topics(self, mock_tavily, mock_openai_insufficient):
+    def test_actualizador_updates_topics(self, mock_tavily, mock_openai_insufficient, traced_app):
         """Test that actualizador_topics replaces topics with missing_topics."""
-        nodes_called = []
+        run_agent(
+            objective="Test",
+            start_date="2026-01-20",
+            end_date="2026-02-03"
+        )
 
-        original_stream = app.stream
+        assert "actualizador_topics" in traced_app
 
-        def tracking_stream(inputs):
-            for output in original_stream(inputs):
-                for key in output.keys():
-                    nodes_called.append(key)
-                yield output
 
-        with patch.object(app, 'stream', tracking_stream):
-            run_agent(
-                objective="Test",
-                start_date="2026-01-20",
-                end_date="2026-02-03"
-            )
+@pytest.fixture(scope="session")
+def graph_json():
+    """The compiled graph's JSON view; app is module-level, so build it once."""
+    return app.get_graph().to_json()
 
-        assert "actualizador_topics" in nodes_called
+
+@pytest.fixture(scope="session")
+def graph_node_ids(graph_json):
+    """Set of node ids in the compiled graph."""
+    return {node["id"] for node in graph_json["nodes"]}
 
 
 class TestGraphCompilation:
@@ -132,105 +137,129 @@ class TestGraphCompilation:
         """Test that the graph compiles without errors."""
         assert app is not None
 
-    def test_graph_has_correct_entry_point(self):
+    def test_graph_has_correct_entry_point(self, graph_json):
         """Test that the graph starts at explorador."""
-        graph_dict = app.get_graph().to_json()
-        assert "explorador" in str(graph_dict)
+        assert {"source": "__start__", "target": "explorador"} in graph_json["edges"]
 
-    def test_graph_has_enriquecedor_node(self):
+    def test_graph_has_enriquecedor_node(self, graph_node_ids):
         """Test that the graph includes the Pioneer enricher node."""
-        graph_dict = app.get_graph().to_json()
-        assert "enriquecedor" in str(graph_dict)
+        assert "enriquecedor" in graph_node_ids
 
-    def test_graph_has_actualizador_node(self):
+    def test_graph_has_actualizador_node(self, graph_node_ids):
         """Test that the graph includes the topic updater node."""
-        graph_dict = app.get_graph().to_json()
-        assert "actualizador_topics" in str(graph_dict)
+        assert "actualizador_topics" in graph_node_ids
 
-    def test_initial_state_structure(self):
-        """Test that initial state has all required fields."""
-        initial_state: GraphState = {
-            "objective": "Test",
-            "context": "",
+    def test_dispatch_searches_sends_one_task_per_topic(self):
+        """Each planned topic should become its own buscador task."""
+        sends = dispatch_searches({
+            "topics": ["Topic 1", "Topic 2"],
             "start_date": "2026-01-20",
             "end_date": "2026-02-03",
-            "exploration_results": [],
-            "topics": [],
-            "planning_reasoning": "",
-            "raw_content": [],
-            "evaluation": None,
-            "search_iterations": 0,
-            "digest": None,
-            "video_sources": [],
-            "visual_analysis": [],
-        }
-
-        required_fields = [
+            "search_iterations": 1,
+        })
+
+        assert [s.node for s in sends] == ["buscador", "buscador"]
+        assert [s.arg["topics"] for s in sends] == [["Topic 1"], ["Topic 2"]]
+        assert all(s.arg["search_iterations"] == 1 for s in sends)
+
+    def test_merge_raw_content_upserts_by_topic(self):
+        """Parallel writes append new topics; re-writes replace them in place."""
+        merged = merge_raw_content([{"topic": "a", "v": 1}], [{"topic": "b", "v": 1}])
+        merged = merge_raw_content(merged, [{"topic": "a", "v": 2}])
+
+        assert merged == [{"topic": "a", "v": 2}, {"topic": "b", "v": 1}]
+
+    def test_merge_raw_content_keeps_sources_on_retry_with_same_topic(self):
+        """A retry search repeating a topic name adds new URLs without dropping enriched sources."""
+        enriched = {"url": "https://old.com", "content": "Full text", "entities": {"ORG": ["OpenAI"]}}
+        left = [{"topic": "a", "search_iteration": 0, "sources": [enriched]}]
+        retry = [{"topic": "a", "search_iteration": 1, "sources": [
+            {"url": "https://old.com", "content": "snippet"},
+            {"url": "https://new.com", "content": "snippet"},
+        ]}]
+
+        merged = merge_raw_content(left, retry)
+
+        assert len(merged) == 1
+        assert merged[0]["sources"] == [enriched, {"url": "https://new.com", "content": "snippet"}]
+        # The extractor's full-list update for the same iteration still replaces the item
+        updated = [{**merged[0], "sources": [enriched]}]
+        assert merge_raw_content(merged, updated)[0]["sources"] == [enriched]
+
+    def test_initial_state_structure(self):
+        """agent.initial_state should set every field the graph reads."""
+        state = initial_state("Test", "2026-01-20", "2026-02-03")
+
+        required_fields = frozenset({
             "objective", "context", "start_date", "end_date",
             "exploration_results", "topics", "planning_reasoning",
-            "raw_content", "evaluation", "search_iterations", "digest",
+            "raw_content", "seen_urls", "seen_hashes", "entities_present",
+            "evaluation", "search_iterations", "digest",
             "video_sources", "visual_analysis",
-        ]
+        })
+
+        missing = required_fields - state.keys()
+        assert not missing, f"missing {sorted(missing)}"
+
+
+@pytest.fixture(scope="session")
+def saved_report_file(tmp_path_factory, sample_digest):
+    """Write one report with save_report; returns (path, returned ReportOutput)."""
+    filepath = tmp_path_factory.mktemp("reports") / "test_report.json"
+    report = save_report(
+        digest=sample_digest,
+        objective="Test objective",
+        start_date="2026-01-20",
+        end_date="2026-02-03",
+        filename=str(filepath),
+    )
+    return filepath, report
 
-        for field in required_fields:
-            assert field in initial_state
+
+@pytest.fixture(scope="session")
+def loaded_report(saved_report_file):
+    """The saved report parsed back into a ReportOutput, once per session."""
+    filepath, _ = saved_report_file
+    return ReportOutput.model_validate_json(filepath.read_bytes())
 
 
 class TestSaveReport:
     """Tests for JSON report output."""
 
-    def test_save_report_creates_json_file(self, sample_digest, tmp_path):
+    def test_save_report_creates_json_file(self, saved_report_file):
         """save_report should create a valid JSON file."""
-        filepath = tmp_path / "test_report.json"
-
-        report = save_report(
-            digest=sample_digest,
-            objective="Test objective",
-            start_date="2026-01-20",
-            end_date="2026-02-03",
-            filename=str(filepath),
-        )
+        filepath, report = saved_report_file
 
         assert filepath.exists()
         assert isinstance(report, ReportOutput)
 
-    def test_saved_json_is_valid_report_output(self, sample_digest, tmp_path):
+    @pytest.mark.parametrize("attr, expected", [
+        ("objective", "Test objective"),
+        ("period_start", "2026-01-20"),
+        ("period_end", "2026-02-03"),
+    ])
+    def test_saved_json_is_valid_report_output(self, loaded_report, attr, expected):
         """The saved JSON should deserialize back into a ReportOutput."""
-        filepath = tmp_path / "test_report.json"
-
-        save_report(
-            digest=sample_digest,
-            objective="Test objective",
-            start_date="2026-01-20",
-            end_date="2026-02-03",
-            filename=str(filepath),
-        )
+        assert getattr(loaded_report, attr) == expected
 
-        loaded = ReportOutput.model_validate_json(filepath.read_text(encoding="utf-8"))
-        assert loaded.objective == "Test objective"
-        assert loaded.period_start == "2026-01-20"
-        assert loaded.period_end == "2026-02-03"
-        assert len(loaded.digest.sections) == len(sample_digest.sections)
-
-    def test_saved_json_preserves_section_data(self, sample_digest, tmp_path):
+    def test_saved_json_preserves_section_data(self, loaded_report, sample_digest):
         """Section titles, articles, and sources should survive round-trip."""
-        filepath = tmp_path / "test_report.json"
-
-        save_report(
-            digest=sample_digest,
-            objective="Test",
-            start_date="2026-01-20",
-            end_date="2026-02-03",
-            filename=str(filepath),
-        )
-
-        loaded = ReportOutput.model_validate_json(filepath.read_text(encoding="utf-8"))
-
-        for original, loaded_sec in zip(sample_digest.sections, loaded.digest.sections):
+        assert len(loaded_report.digest.sections) == len(sample_digest.sections)
+        for original, loaded_sec in zip(sample_digest.sections, loaded_report.digest.sections):
             assert original.title == loaded_sec.title
             assert original.article == loaded_sec.article
             assert original.sources == loaded_sec.sources
 
+    def test_failed_write_leaves_no_temp_file(self, tmp_path, sample_digest, monkeypatch):
+        """A failure before the rename should remove the .tmp file and re-raise."""
+        filepath = tmp_path / "report.json"
+        monkeypatch.setattr("agent.os.replace", MagicMock(side_effect=OSError("disk full")))
+
+        with pytest.raises(OSError):
+            save_report(sample_digest, "Test", "2026-01-20", "2026-02-03", filename=str(filepath))
+
+        assert list(tmp_path.iterdir()) == []
+
 
 class TestErrorHandling:
     """Tests for error handling in the agent flow."""
@@ -3,7 +3,13 @@ Unit tests for the analyst node.
 """
 import pytest
 
-from nodes.analyst import analyze_news_node
+from nodes.analyst import (
+    MAX_SUMMARY_CHARS,
+    SYSTEM_PROMPT,
+    _build_entity_summary,
+    _compact_raw_content,
+    analyze_news_node,
+)
 from models import NewsDigest
 
 
@@ -82,3 +88,65 @@ class TestAnalystNode:
 
         # Verify it produces output (integration with objective is tested by behavior)
         assert result["digest"] is not None
+
+    def test_date_stays_out_of_cached_system_prefix(self, mock_openai, monkeypatch, sample_digest, sample_raw_content):
+        """Only the static instructions should go in the system message."""
+        prompts = []
+
+        def capture(model, schema, prompt):
+            prompts.append(prompt)
+            return sample_digest
+
+        monkeypatch.setattr("nodes.analyst.cached_structured_invoke", capture)
+
+        analyze_news_node({"objective": "AI regulation news", "raw_content": sample_raw_content})
+
+        system, user = prompts[0]
+        assert system.content == SYSTEM_PROMPT
+        assert "Today's date is" in user.content
+
+
+class TestBuildEntitySummary:
+    """Tests for _build_entity_summary."""
+
+    def test_dedupes_sorts_and_caps_values(self):
+        """Values are deduplicated across sources, sorted, and capped at 15 per label."""
+        people = [f"Person {i:02d}" for i in range(20)]
+        raw_content = [
+            {"topic": "A", "sources": [{"entities": {"PERSON": people[::-1], "ORG": ["Beta", "Acme"]}}]},
+            {"topic": "B", "sources": [{"entities": {"ORG": ["Acme"]}}]},
+        ]
+
+        summary = _build_entity_summary(raw_content)
+
+        lines = summary.splitlines()
+        assert lines[1] == "  ORG: Acme, Beta"
+        assert lines[2] == "  PERSON: " + ", ".join(people[:15])
+
+    def test_returns_empty_without_entities(self, sample_raw_content):
+        """No Pioneer entities means no summary block."""
+        assert _build_entity_summary(sample_raw_content) == ""
+
+
+class TestCompactRawContent:
+    """Tests for _compact_raw_content."""
+
+    def test_truncates_content_and_drops_extra_fields(self):
+        """Only the prompt fields survive, with content cut to a summary."""
+        raw_content = [{
+            "topic": "A",
+            "sources": [{
+                "url": "https://a.com",
+                "title": "T",
+                "content": "x" * 5000,
+                "favicon": "https://a.com/favicon.ico",
+                "entities": {"ORG": ["Acme"]},
+            }],
+        }]
+
+        source = _compact_raw_content(raw_content)[0]["sources"][0]
+
+        assert len(source["summary"]) == MAX_SUMMARY_CHARS
+        assert source["entities"] == {"ORG": ["Acme"]}
+        assert "favicon" not in source
+        assert "content" not in source
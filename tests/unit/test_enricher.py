@@ -4,39 +4,45 @@ Unit tests for the enricher node (Pioneer AI entity extraction).
 import pytest
 from unittest.mock import MagicMock
 
+from nodes import enricher
 from nodes.enricher import enrich_content_node
+from nodes.llm_cache import LLMCache
+
+# Bodies below the enricher's 20-char minimum and above its 4000-char cap
+_SHORT_CONTENT = "Too short"
+_LONG_CONTENT = "A" * 10000
+
+
+@pytest.fixture
+def enricher_result(mock_openai, sample_raw_content):
+    """enrich_content_node output for sample_raw_content with the default mocks."""
+    return enrich_content_node({"raw_content": sample_raw_content})
 
 
 class TestEnricherNode:
     """Tests for enrich_content_node function."""
 
-    def test_returns_enriched_raw_content(self, mock_openai, sample_raw_content):
+    def test_returns_enriched_raw_content(self, enricher_result, sample_raw_content):
         """Enricher should return raw_content with entities added."""
-        state = {"raw_content": sample_raw_content}
-
-        result = enrich_content_node(state)
+        assert "raw_content" in enricher_result
+        assert len(enricher_result["raw_content"]) == len(sample_raw_content)
 
-        assert "raw_content" in result
-        assert len(result["raw_content"]) == len(sample_raw_content)
-
-    def test_adds_entities_to_sources(self, mock_openai, sample_raw_content):
+    def test_adds_entities_to_sources(self, enricher_result):
         """Each source should have an 'entities' field after enrichment."""
-        state = {"raw_content": sample_raw_content}
-
-        result = enrich_content_node(state)
-
-        for topic_data in result["raw_content"]:
+        for topic_data in enricher_result["raw_content"]:
             for source in topic_data["sources"]:
                 assert "entities" in source
 
     def test_entities_are_grouped_by_label(self, monkeypatch, sample_raw_content):
         """Entities should be grouped as {label: [values]}."""
-        mock_pioneer = MagicMock(return_value=[
-            {"label": "PERSON", "text": "Tim Cook"},
-            {"label": "ORGANIZATION", "text": "Apple"},
-            {"label": "ORGANIZATION", "text": "Google"},
-        ])
-        monkeypatch.setattr("nodes.enricher.pioneer_extract", mock_pioneer)
+        def fake_pioneer(model_id, text, schema):
+            return [
+                {"label": "PERSON", "text": "Tim Cook"},
+                {"label": "ORGANIZATION", "text": "Apple"},
+                {"label": "ORGANIZATION", "text": "Google"},
+            ]
+
+        monkeypatch.setattr("nodes.enricher.pioneer_extract", fake_pioneer)
 
         state = {"raw_content": sample_raw_content}
         result = enrich_content_node(state)
@@ -59,8 +65,7 @@ class TestEnricherNode:
 
     def test_handles_pioneer_returning_empty(self, monkeypatch, sample_raw_content):
         """Enricher should handle Pioneer returning no entities gracefully."""
-        mock_pioneer = MagicMock(return_value=[])
-        monkeypatch.setattr("nodes.enricher.pioneer_extract", mock_pioneer)
+        monkeypatch.setattr("nodes.enricher.pioneer_extract", lambda model_id, text, schema: [])
 
         state = {"raw_content": sample_raw_content}
         result = enrich_content_node(state)
@@ -71,12 +76,12 @@ class TestEnricherNode:
 
     def test_skips_short_content(self, monkeypatch, sample_raw_content):
         """Enricher should skip sources with very short content."""
-        mock_pioneer = MagicMock(return_value=[
-            {"label": "PERSON", "text": "Test"},
-        ])
-        monkeypatch.setattr("nodes.enricher.pioneer_extract", mock_pioneer)
+        def fake_pioneer(model_id, text, schema):
+            return [{"label": "PERSON", "text": "Test"}]
 
-        sample_raw_content[0]["sources"][0]["content"] = "Too short"
+        monkeypatch.setattr("nodes.enricher.pioneer_extract", fake_pioneer)
+
+        sample_raw_content[0]["sources"][0]["content"] = _SHORT_CONTENT
         state = {"raw_content": sample_raw_content}
 
         result = enrich_content_node(state)
@@ -94,9 +99,95 @@ class TestEnricherNode:
 
         monkeypatch.setattr("nodes.enricher.pioneer_extract", capture_pioneer)
 
-        sample_raw_content[0]["sources"][0]["content"] = "A" * 10000
+        sample_raw_content[0]["sources"][0]["content"] = _LONG_CONTENT
         state = {"raw_content": sample_raw_content}
 
         enrich_content_node(state)
 
         assert len(call_args[0]) == 4000
+
+    def test_cached_texts_skip_pioneer(self, monkeypatch, tmp_path, sample_raw_content):
+        """With PIONEER_CACHE on, a second pass over the same texts should not call Pioneer."""
+        mock_pioneer = MagicMock(return_value=[{"label": "PERSON", "text": "Test"}])
+        monkeypatch.setattr("nodes.enricher.pioneer_extract", mock_pioneer)
+        monkeypatch.setattr(enricher, "PIONEER_CACHE_ENABLED", True)
+        monkeypatch.setattr(
+            enricher, "_entity_cache", LLMCache(tmp_path / "pioneer.sqlite", table="pioneer_entities")
+        )
+
+        enrich_content_node({"raw_content": sample_raw_content})
+        first_calls = mock_pioneer.call_count
+        result = enrich_content_node({"raw_content": sample_raw_content})
+
+        assert mock_pioneer.call_count == first_calls
+        assert result["raw_content"][0]["sources"][0]["entities"] == {"PERSON": ["Test"]}
+
+    def test_duplicate_bodies_call_pioneer_once(self, monkeypatch):
+        """Identical article bodies should be enriched once and share entities."""
+        mock_pioneer = MagicMock(return_value=[{"label": "PERSON", "text": "Ada"}])
+        monkeypatch.setattr("nodes.enricher.pioneer_extract", mock_pioneer)
+        body = "The same syndicated article body about Ada appears twice."
+        state = {"raw_content": [
+            {"topic": "A", "sources": [{"url": "https://a.com", "title": "A", "content": body}]},
+            {"topic": "B", "sources": [{"url": "https://b.com", "title": "B", "content": body}]},
+        ]}
+
+        result = enrich_content_node(state)
+
+        assert mock_pioneer.call_count == 1
+        assert result["raw_content"][1]["sources"][0]["entities"] == {"PERSON": ["Ada"]}
+        assert len(result["seen_hashes"]) == 1
+
+    def test_skips_bodies_enriched_in_previous_iteration(self, monkeypatch):
+        """Sources whose body hash is in seen_hashes should not reach Pioneer."""
+        mock_pioneer = MagicMock(return_value=[])
+        monkeypatch.setattr("nodes.enricher.pioneer_extract", mock_pioneer)
+        body = "An article that was already enriched on the first loop."
+        source = {"url": "https://a.com", "title": "A", "content": body, "entities": {"ORG": ["X"]}}
+        state = {
+            "raw_content": [{"topic": "A", "sources": [source]}],
+            "seen_hashes": {enricher._body_hash(body)},
+        }
+
+        result = enrich_content_node(state)
+
+        mock_pioneer.assert_not_called()
+        assert result["raw_content"][0]["sources"][0]["entities"] == {"ORG": ["X"]}
+
+    def test_concurrent_calls_keep_source_order(self, monkeypatch):
+        """Results from concurrent Pioneer calls should land on the right sources."""
+        monkeypatch.setattr(
+            "nodes.enricher.pioneer_extract",
+            lambda model_id, text, schema: [{"label": "EVENT", "text": text.split()[0]}],
+        )
+        sources = [
+            {"url": f"https://s{i}.com", "title": str(i), "content": f"Body{i} of a long enough article text"}
+            for i in range(12)
+        ]
+
+        result = enrich_content_node({"raw_content": [{"topic": "T", "sources": sources}]})
+
+        for i, source in enumerate(result["raw_content"][0]["sources"]):
+            assert source["entities"] == {"EVENT": [f"Body{i}"]}
+
+    def test_flags_whether_entities_were_found(self, monkeypatch, sample_raw_content):
+        """entities_present should tell the analyst whether to build a summary."""
+        monkeypatch.setattr("nodes.enricher.pioneer_extract", MagicMock(return_value=[]))
+
+        result = enrich_content_node({"raw_content": sample_raw_content})
+
+        assert result["entities_present"] is False
+
+
+class TestSanitizeForPioneer:
+    """Tests for _sanitize_for_pioneer."""
+
+    def test_strips_html_and_script_bodies(self):
+        """Markup and script/style contents should not reach Pioneer."""
+        text = "<div><script>var x=1;</script><p>Hello <b>world</b></p><style>p{}</style>Tail</div>"
+
+        assert enricher._sanitize_for_pioneer(text) == "Hello world Tail"
+
+    def test_plain_text_with_angle_brackets(self):
+        """Text that only looks like markup should survive without brackets."""
+        assert enricher._sanitize_for_pioneer("a < b and c > d") == "a b and c d"
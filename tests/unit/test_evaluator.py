@@ -1,9 +1,19 @@
 """
 Unit tests for the evaluator node.
 """
+from datetime import date
+from unittest.mock import MagicMock
+
 import pytest
 
-from nodes.evaluator import evaluator_node, should_search_more
+from nodes.evaluator import (
+    MAX_SUMMARY_CHARS,
+    _is_within_range,
+    _parse_published,
+    _summarize_topics,
+    evaluator_node,
+    should_search_more,
+)
 from models import Evaluation, MAX_SEARCH_ITERATIONS
 
 
@@ -50,61 +60,141 @@ class TestEvaluatorNode:
 
         assert "evaluation" in result
 
+    def test_skips_llm_when_deterministic_criteria_pass(self, monkeypatch):
+        """Three solid topics in range should be sufficient without an LLM call."""
+        llm = MagicMock()
+        monkeypatch.setattr("nodes.evaluator.cached_structured_invoke", llm)
+        raw_content = [
+            {"topic": f"Topic {i}", "sources": [
+                {"title": "A", "content": "Revenue rose 12% to $4.2B"},
+                {"title": "B", "content": "Analysts expect more growth"},
+            ]}
+            for i in range(3)
+        ]
+
+        result = evaluator_node({"objective": "x", "raw_content": raw_content, "search_iterations": 1})
+
+        llm.assert_not_called()
+        assert result["evaluation"].is_sufficient is True
+
+    def test_dates_alone_are_not_concrete_figures(self, mock_openai, monkeypatch, sample_evaluation_insufficient):
+        """Years and dates in article text should not satisfy the concrete-figure bar."""
+        llm = MagicMock(return_value=sample_evaluation_insufficient)
+        monkeypatch.setattr("nodes.evaluator.cached_structured_invoke", llm)
+        raw_content = [
+            {"topic": f"Topic {i}", "sources": [
+                {"title": "A", "content": "On 3 February 2026 the ministry met again"},
+                {"title": "B", "content": "Talks started in 2024"},
+            ]}
+            for i in range(3)
+        ]
+
+        evaluator_node({"objective": "x", "raw_content": raw_content, "search_iterations": 1})
+
+        llm.assert_called_once()
+
+    def test_calls_llm_when_a_planned_topic_is_missing(self, mock_openai, monkeypatch, sample_evaluation_insufficient):
+        """Solid coverage of some topics should not hide a planned topic with no results."""
+        llm = MagicMock(return_value=sample_evaluation_insufficient)
+        monkeypatch.setattr("nodes.evaluator.cached_structured_invoke", llm)
+        raw_content = [
+            {"topic": f"Topic {i}", "sources": [
+                {"title": "A", "content": "Revenue rose 12% to $4.2B"},
+                {"title": "B", "content": "Analysts expect more growth"},
+            ]}
+            for i in range(3)
+        ]
+
+        result = evaluator_node({
+            "objective": "x",
+            "topics": ["Topic 0", "Topic 1", "Topic 2", "Topic 3"],
+            "raw_content": raw_content,
+            "search_iterations": 1,
+        })
 
-class TestShouldSearchMore:
-    """Tests for should_search_more conditional edge function."""
+        llm.assert_called_once()
+        assert result["evaluation"].is_sufficient is False
 
-    def test_returns_analista_when_sufficient(self, sample_evaluation_sufficient):
-        """Should route to analista when coverage is sufficient."""
-        state = {
-            "evaluation": sample_evaluation_sufficient,
-            "search_iterations": 1,
-        }
+    def test_skips_llm_at_iteration_limit(self, monkeypatch, sample_raw_content):
+        """With no retries left the evaluation is sufficient without an LLM call."""
+        llm = MagicMock()
+        monkeypatch.setattr("nodes.evaluator.cached_structured_invoke", llm)
+
+        result = evaluator_node({
+            "objective": "x",
+            "raw_content": sample_raw_content,
+            "search_iterations": MAX_SEARCH_ITERATIONS,
+        })
+
+        llm.assert_not_called()
+        assert result["evaluation"].is_sufficient is True
 
-        result = should_search_more(state)
 
-        assert result == "analista"
+class TestShouldSearchMore:
+    """Tests for should_search_more conditional edge function."""
 
-    def test_returns_buscador_when_insufficient(self, sample_evaluation_insufficient):
-        """Should route to buscador when coverage is insufficient."""
+    @pytest.mark.parametrize("eval_fixture, iterations, expected", [
+        ("sample_evaluation_sufficient", 1, "analista"),
+        ("sample_evaluation_insufficient", 1, "buscador"),
+        ("sample_evaluation_insufficient", MAX_SEARCH_ITERATIONS, "analista"),
+        (None, 1, "analista"),
+        ("sample_evaluation_insufficient", MAX_SEARCH_ITERATIONS + 1, "analista"),
+    ], ids=[
+        "sufficient",
+        "insufficient",
+        "max_iterations_reached",
+        "no_evaluation",
+        "past_iteration_limit",
+    ])
+    def test_routes(self, request, eval_fixture, iterations, expected):
+        """Route to buscador only for insufficient coverage under the iteration limit."""
+        evaluation = request.getfixturevalue(eval_fixture) if eval_fixture else None
         state = {
-            "evaluation": sample_evaluation_insufficient,
-            "search_iterations": 1,
+            "evaluation": evaluation,
+            "search_iterations": iterations,
         }
 
-        result = should_search_more(state)
+        assert should_search_more(state) == expected
 
-        assert result == "buscador"
 
-    def test_returns_analista_when_max_iterations_reached(self, sample_evaluation_insufficient):
-        """Should route to analista when max iterations reached, even if insufficient."""
-        state = {
-            "evaluation": sample_evaluation_insufficient,
-            "search_iterations": MAX_SEARCH_ITERATIONS,
-        }
+class TestIsWithinRange:
+    """Tests for _is_within_range date filtering."""
 
-        result = should_search_more(state)
+    @pytest.mark.parametrize("pub, expected", [
+        ("Tue, 27 Jan 2026 10:00:00 GMT", True),
+        ("Mon, 05 Jan 2026 10:00:00 GMT", False),
+        ("Tue, 3 Feb 2026 23:00:00 -0500", True),
+        ("2026-01-27T10:00:00Z", True),
+        ("2026-02-10", False),
+        ("", True),
+        ("not a date", True),
+    ])
+    def test_rfc2822_and_iso_dates(self, pub, expected):
+        """Both RFC 2822 and ISO dates are checked against the parsed window."""
+        assert _is_within_range(pub, date(2026, 1, 20), date(2026, 2, 3)) is expected
 
-        assert result == "analista"
+    def test_repeated_dates_are_parsed_once(self):
+        """Identical published_date strings hit the memoized parser."""
+        _parse_published.cache_clear()
+        for _ in range(3):
+            _is_within_range("Wed, 28 Jan 2026 08:00:00 GMT", date(2026, 1, 20), date(2026, 2, 3))
 
-    def test_returns_analista_when_no_evaluation(self):
-        """Should route to analista when evaluation is missing."""
-        state = {
-            "evaluation": None,
-            "search_iterations": 1,
-        }
+        info = _parse_published.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
 
-        result = should_search_more(state)
 
-        assert result == "analista"
+class TestSummarizeTopics:
+    """Tests for _summarize_topics prompt budget."""
 
-    def test_respects_iteration_limit(self, sample_evaluation_insufficient):
-        """Should not exceed MAX_SEARCH_ITERATIONS."""
-        state = {
-            "evaluation": sample_evaluation_insufficient,
-            "search_iterations": MAX_SEARCH_ITERATIONS + 1,
-        }
+    def test_caps_summary_and_counts_hidden_topics(self):
+        """Topics past the character budget are summarized as a count."""
+        raw_content = [
+            {"topic": f"Topic {i}", "sources": [{"title": "T" * 100, "published_date": "2026-01-01"}] * 3}
+            for i in range(200)
+        ]
 
-        result = should_search_more(state)
+        summary = _summarize_topics(raw_content)
 
-        assert result == "analista"
+        assert len(summary) < MAX_SUMMARY_CHARS + 1000
+        assert summary.endswith("more topics")
+        assert "Topic 0\n" in summary
@@ -1,10 +1,11 @@
 """
 Unit tests for the extractor node.
 """
-import pytest
-
 from nodes.extractor import extract_content_node
 
+# Extracted body longer than the extractor's 3000-char cap
+_LONG_CONTENT = "x" * 5000
+
 
 class TestExtractorNode:
     """Tests for extract_content_node function."""
@@ -18,14 +19,15 @@ class TestExtractorNode:
         assert "raw_content" in result
         assert isinstance(result["raw_content"], list)
     
-    def test_calls_extract_for_each_topic(self, mock_tavily, sample_raw_content):
-        """Extractor should call Tavily extract for each topic's URLs."""
+    def test_batches_urls_across_topics(self, mock_tavily, sample_raw_content):
+        """Extractor should send every topic's URLs in a single Tavily extract call."""
         state = {"raw_content": sample_raw_content}
         
         extract_content_node(state)
         
-        # Should be called once per topic with sources
-        assert mock_tavily.extract.call_count == len(sample_raw_content)
+        mock_tavily.extract.assert_called_once_with([
+            source["url"] for topic in sample_raw_content for source in topic["sources"]
+        ])
     
     def test_handles_empty_sources(self, mock_tavily):
         """Extractor should handle topics with no sources."""
@@ -37,9 +39,10 @@ class TestExtractorNode:
         
         result = extract_content_node(state)
         
-        # Should not call extract for empty sources
+        # Should not call extract for empty sources, or mark anything as seen
         mock_tavily.extract.assert_not_called()
         assert len(result["raw_content"]) == 1
+        assert result["seen_urls"] == set()
     
     def test_handles_extraction_errors(self, mock_tavily, sample_raw_content):
         """Extractor should handle API errors gracefully."""
@@ -81,9 +84,8 @@ class TestExtractorNode:
     
     def test_truncates_content_to_3000_chars(self, mock_tavily):
         """Extractor should truncate extracted content to 3000 characters."""
-        long_content = "x" * 5000
         mock_tavily.extract.return_value = {
-            "results": [{"url": "https://test.com", "raw_content": long_content}],
+            "results": [{"url": "https://test.com", "raw_content": _LONG_CONTENT}],
             "failed_results": []
         }
         
@@ -97,3 +99,74 @@ class TestExtractorNode:
         
         extracted_content = result["raw_content"][0]["sources"][0]["content"]
         assert len(extracted_content) <= 3000
+
+    def test_preserves_topic_order(self, mock_tavily):
+        """Concurrent extraction should keep raw_content in input order."""
+        topics = [
+            {"topic": f"Topic {i}", "sources": [{"url": f"https://t{i}.com", "title": "", "content": ""}]}
+            for i in range(10)
+        ]
+        mock_tavily.extract.return_value = {"results": [], "failed_results": []}
+
+        result = extract_content_node({"raw_content": topics})
+
+        assert [t["topic"] for t in result["raw_content"]] == [f"Topic {i}" for i in range(10)]
+
+    def test_skips_urls_seen_in_previous_iteration(self, mock_tavily):
+        """URLs already in seen_urls should not be sent to Tavily extract again."""
+        topics = [
+            {"topic": "Old", "sources": [{"url": "https://old.com", "title": "", "content": "kept"}]},
+            {"topic": "New", "sources": [{"url": "https://new.com", "title": "", "content": ""}]},
+        ]
+        mock_tavily.extract.return_value = {"results": [], "failed_results": []}
+
+        result = extract_content_node({"raw_content": topics, "seen_urls": {"https://old.com"}})
+
+        mock_tavily.extract.assert_called_once_with(["https://new.com"])
+        assert result["seen_urls"] == {"https://new.com"}
+        assert result["raw_content"][0]["sources"][0]["content"] == "kept"
+
+    def test_refound_url_reuses_extracted_content(self, mock_tavily):
+        """A retry topic that re-finds an extracted URL should get its full content, not the snippet."""
+        topics = [
+            {"topic": "Old", "sources": [{"url": "https://old.com", "title": "", "content": "Full article text"}]},
+            {"topic": "Retry", "sources": [{"url": "https://old.com", "title": "", "content": "snippet"}]},
+        ]
+
+        result = extract_content_node({"raw_content": topics, "seen_urls": {"https://old.com"}})
+
+        mock_tavily.extract.assert_not_called()
+        assert [t["sources"][0]["content"] for t in result["raw_content"]] == [
+            "Full article text", "Full article text",
+        ]
+
+    def test_splits_more_than_batch_size_urls(self, mock_tavily):
+        """URLs beyond Tavily's per-request limit should go in additional batches."""
+        topics = [
+            {"topic": f"Topic {i}", "sources": [
+                {"url": f"https://{i}-{j}.com", "title": "", "content": ""} for j in range(5)
+            ]}
+            for i in range(5)
+        ]
+        mock_tavily.extract.return_value = {"results": [], "failed_results": []}
+
+        extract_content_node({"raw_content": topics})
+
+        batch_sizes = sorted(len(call.args[0]) for call in mock_tavily.extract.call_args_list)
+        assert batch_sizes == [5, 20]
+
+    def test_shared_url_is_extracted_once_for_all_topics(self, mock_tavily):
+        """A URL listed under several topics should be requested once and fill every copy."""
+        topics = [
+            {"topic": "A", "sources": [{"url": "https://same.com", "title": "", "content": ""}]},
+            {"topic": "B", "sources": [{"url": "https://same.com", "title": "", "content": ""}]},
+        ]
+        mock_tavily.extract.return_value = {
+            "results": [{"url": "https://same.com", "raw_content": "Full text"}],
+            "failed_results": [],
+        }
+
+        result = extract_content_node({"raw_content": topics})
+
+        mock_tavily.extract.assert_called_once_with(["https://same.com"])
+        assert [t["sources"][0]["content"] for t in result["raw_content"]] == ["Full text", "Full text"]
@@ -0,0 +1,97 @@
+"""
+Unit tests for the structured LLM prompt cache.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import create_model
+
+from models import SearchPlan
+from nodes import llm_cache
+from nodes.llm_cache import LLMCache, cached_structured_invoke
+
+
+@pytest.fixture
+def enabled_cache(monkeypatch, tmp_path):
+    """Enable the cache with a fresh SQLite file under tmp_path."""
+    cache = LLMCache(tmp_path / "llm.sqlite", max_entries=8)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_cache, "_cache", cache)
+    return cache
+
+
+def _model_returning(value):
+    model = MagicMock()
+    model.model_name = "test-model"
+    model.with_structured_output.return_value.invoke.return_value = value
+    return model
+
+
+class TestLLMCache:
+    """Tests for LLMCache and cached_structured_invoke."""
+
+    def test_disabled_cache_always_invokes_model(self, monkeypatch, sample_search_plan):
+        """With the cache off every call should reach the model."""
+        monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", False)
+        model = _model_returning(sample_search_plan)
+
+        cached_structured_invoke(model, SearchPlan, "same prompt")
+        cached_structured_invoke(model, SearchPlan, "same prompt")
+
+        assert model.with_structured_output.return_value.invoke.call_count == 2
+
+    def test_structured_runnable_is_built_once(self, monkeypatch, sample_search_plan):
+        """with_structured_output should run once per model and schema, not per call."""
+        monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", False)
+        model = _model_returning(sample_search_plan)
+
+        cached_structured_invoke(model, SearchPlan, "first prompt")
+        cached_structured_invoke(model, SearchPlan, "second prompt")
+
+        assert model.with_structured_output.call_count == 1
+
+    def test_identical_prompt_hits_cache(self, enabled_cache, sample_search_plan):
+        """A repeated prompt should be served from the cache."""
+        model = _model_returning(sample_search_plan)
+
+        first = cached_structured_invoke(model, SearchPlan, "same prompt")
+        second = cached_structured_invoke(model, SearchPlan, "same prompt")
+
+        assert model.with_structured_output.return_value.invoke.call_count == 1
+        assert second == first
+
+    def test_stale_row_is_treated_as_a_miss(self, enabled_cache, sample_search_plan):
+        """A cached value that no longer validates should be recomputed and overwritten."""
+        model = _model_returning(sample_search_plan)
+        key = llm_cache.cache_key(model, SearchPlan, "same prompt")
+        enabled_cache.set(key, '{"old_field": 1}')
+
+        result = cached_structured_invoke(model, SearchPlan, "same prompt")
+
+        assert result == sample_search_plan
+        assert model.with_structured_output.return_value.invoke.call_count == 1
+        assert SearchPlan.model_validate_json(enabled_cache.get(key)) == sample_search_plan
+
+    def test_key_changes_with_schema_fields(self):
+        """Two schemas sharing a name but not fields should not share keys."""
+        model = _model_returning(None)
+        old = create_model("SearchPlan", topics=(list[str], ...))
+
+        assert llm_cache.cache_key(model, old, "p") != llm_cache.cache_key(model, SearchPlan, "p")
+
+    def test_sqlite_tier_survives_new_instance(self, tmp_path):
+        """Entries written to SQLite should be readable by a new cache instance."""
+        LLMCache(tmp_path / "llm.sqlite").set("k", "v")
+
+        assert LLMCache(tmp_path / "llm.sqlite").get("k") == "v"
+
+    def test_evicts_least_recently_used(self):
+        """The in-memory tier should stay bounded to max_entries."""
+        cache = LLMCache(None, max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
@@ -0,0 +1,35 @@
+"""
+Unit tests for the Pioneer AI client.
+"""
+from unittest.mock import MagicMock
+
+from nodes import pioneer_client
+from nodes.pioneer_client import pioneer_extract
+
+
+def _response(status_code: int, content: bytes) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    return response
+
+
+class TestPioneerExtract:
+    """Tests for pioneer_extract."""
+
+    def test_retry_after_5xx_resends_the_same_payload(self, monkeypatch):
+        """A retry after a 5xx should post the original JSON body, not the error text."""
+        session = MagicMock()
+        session.post.side_effect = [
+            _response(503, b"Service Unavailable"),
+            _response(200, b'{"result": {"entities": {"company": ["BYD"]}}}'),
+        ]
+        monkeypatch.setattr(pioneer_client, "_session", session)
+        monkeypatch.setattr(pioneer_client.time, "sleep", lambda _: None)
+
+        entities = pioneer_extract("model-id", "BYD opens a plant", ["company"])
+
+        assert entities == [{"label": "company", "text": "BYD"}]
+        first, second = (call.kwargs["data"] for call in session.post.call_args_list)
+        assert first == second
+        assert isinstance(first, bytes)
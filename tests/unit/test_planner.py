@@ -3,57 +3,66 @@ Unit tests for the planner node.
 """
 import pytest
 
-from nodes.planner import planner_node
+from nodes import planner
+from nodes.planner import SYSTEM_PROMPT, _plan_cache_key, planner_node
 
 
 class TestPlannerNode:
     """Tests for planner_node function."""
 
-    def test_returns_topics_list(self, mock_openai, sample_exploration_results):
-        """Planner should return a list of topics."""
+    @pytest.mark.parametrize("exploration", [
+        pytest.param("sample", id="normal"),
+        pytest.param([], id="empty"),
+    ])
+    def test_returns_structured_plan(self, request, mock_openai, exploration):
+        """Planner should return topics and reasoning from the structured SearchPlan."""
+        if exploration == "sample":
+            exploration = request.getfixturevalue("sample_exploration_results")
         state = {
-            "exploration_results": sample_exploration_results,
+            "exploration_results": exploration,
             "objective": "AI regulation news",
         }
 
         result = planner_node(state)
 
-        assert "topics" in result
         assert isinstance(result["topics"], list)
-        assert len(result["topics"]) >= 1
-
-    def test_returns_planning_reasoning(self, mock_openai, sample_exploration_results):
-        """Planner should explain its reasoning."""
-        state = {
-            "exploration_results": sample_exploration_results,
-            "objective": "AI regulation news",
-        }
-
-        result = planner_node(state)
-
-        assert "planning_reasoning" in result
+        assert len(result["topics"]) > 0
         assert isinstance(result["planning_reasoning"], str)
         assert len(result["planning_reasoning"]) > 0
 
-    def test_handles_empty_exploration_results(self, mock_openai):
-        """Planner should handle case with no exploration results."""
-        state = {
-            "exploration_results": [],
-            "objective": "AI regulation news",
-        }
-
-        result = planner_node(state)
+    def test_static_prompt_precedes_run_data(self, mock_openai, monkeypatch, sample_search_plan, sample_exploration_results):
+        """The cacheable system prefix should be static; run data goes in the user message."""
+        prompts = []
 
-        assert "topics" in result
+        def capture(model, schema, prompt, key_text=None):
+            prompts.append(prompt)
+            return sample_search_plan
 
-    def test_uses_structured_output(self, mock_openai, sample_exploration_results):
-        """Planner should use with_structured_output for SearchPlan."""
+        monkeypatch.setattr("nodes.planner.cached_structured_invoke", capture)
         state = {
             "exploration_results": sample_exploration_results,
-            "objective": "Test objective",
+            "objective": "Unique objective 123",
         }
 
-        result = planner_node(state)
+        planner_node(state)
 
-        assert isinstance(result["topics"], list)
-        assert len(result["topics"]) > 0
+        system, user = prompts[0]
+        assert system.content == SYSTEM_PROMPT
+        assert "Unique objective 123" in user.content
+
+    def test_cache_key_ignores_headline_order_and_snippets(self, sample_exploration_results):
+        """Reordered headlines with different punctuation/snippets share a cache key."""
+        rerun = [
+            {**item, "title": item["title"].upper() + "!", "snippet": "changed"}
+            for item in reversed(sample_exploration_results)
+        ]
+
+        assert _plan_cache_key("AI news", "", rerun) == _plan_cache_key("AI news", "", sample_exploration_results)
+        assert _plan_cache_key("Other", "", rerun) != _plan_cache_key("AI news", "", sample_exploration_results)
+
+    def test_cache_key_changes_with_system_prompt(self, monkeypatch, sample_exploration_results):
+        """Editing SYSTEM_PROMPT should invalidate previously cached plans."""
+        before = _plan_cache_key("AI news", "", sample_exploration_results)
+        monkeypatch.setattr(planner, "SYSTEM_PROMPT", SYSTEM_PROMPT + "\nBe brief.")
+
+        assert _plan_cache_key("AI news", "", sample_exploration_results) != before
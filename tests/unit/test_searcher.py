@@ -6,37 +6,29 @@ import pytest
 from nodes.searcher import search_news_node
 
 
+@pytest.fixture
+def search_result(mock_tavily):
+    """search_news_node output for a fresh three-topic state."""
+    return search_news_node({
+        "topics": ["Topic 1", "Topic 2", "Topic 3"],
+        "start_date": "2026-01-20",
+        "end_date": "2026-02-03",
+        "raw_content": [],
+        "search_iterations": 0,
+    })
+
+
 class TestSearcherNode:
     """Tests for search_news_node function."""
 
-    def test_returns_raw_content(self, mock_tavily):
+    def test_returns_raw_content(self, search_result):
         """Searcher should return raw_content with search results."""
-        state = {
-            "topics": ["AI regulation EU"],
-            "start_date": "2026-01-20",
-            "end_date": "2026-02-03",
-            "raw_content": [],
-            "search_iterations": 0,
-        }
-
-        result = search_news_node(state)
-
-        assert "raw_content" in result
-        assert isinstance(result["raw_content"], list)
+        assert "raw_content" in search_result
+        assert isinstance(search_result["raw_content"], list)
 
-    def test_increments_search_iterations(self, mock_tavily):
+    def test_increments_search_iterations(self, search_result):
         """Searcher should increment the iteration counter."""
-        state = {
-            "topics": ["Test topic"],
-            "start_date": "2026-01-20",
-            "end_date": "2026-02-03",
-            "raw_content": [],
-            "search_iterations": 0,
-        }
-
-        result = search_news_node(state)
-
-        assert result["search_iterations"] == 1
+        assert search_result["search_iterations"] == 1
 
     def test_accumulates_results_across_iterations(self, mock_tavily):
         """Searcher should append to existing raw_content."""
@@ -45,58 +37,28 @@ class TestSearcherNode:
             "topics": ["New topic"],
             "start_date": "2026-01-20",
             "end_date": "2026-02-03",
-            "raw_content": existing_content.copy(),
+            "raw_content": existing_content,
             "search_iterations": 1,
         }
 
         result = search_news_node(state)
 
-        # Should have both old and new content
+        # Should have both old and new content, without touching the input list
         assert len(result["raw_content"]) == 2
         assert result["search_iterations"] == 2
+        assert existing_content == [{"topic": "Previous", "sources": []}]
 
-    def test_searches_each_topic(self, mock_tavily):
+    def test_searches_each_topic(self, mock_tavily, search_result):
         """Searcher should call Tavily for each topic."""
-        state = {
-            "topics": ["Topic 1", "Topic 2", "Topic 3"],
-            "start_date": "2026-01-20",
-            "end_date": "2026-02-03",
-            "raw_content": [],
-            "search_iterations": 0,
-        }
-
-        search_news_node(state)
-
         assert mock_tavily.search.call_count == 3
 
-    def test_uses_advanced_search_depth(self, mock_tavily):
+    def test_uses_advanced_search_depth(self, mock_tavily, search_result):
         """Searcher should use advanced search depth for deep results."""
-        state = {
-            "topics": ["Test topic"],
-            "start_date": "2026-01-20",
-            "end_date": "2026-02-03",
-            "raw_content": [],
-            "search_iterations": 0,
-        }
-
-        search_news_node(state)
+        assert all(c.kwargs["search_depth"] == "advanced" for c in mock_tavily.search.call_args_list)
 
-        call_kwargs = mock_tavily.search.call_args.kwargs
-        assert call_kwargs["search_depth"] == "advanced"
-
-    def test_raw_content_has_required_structure(self, mock_tavily):
+    def test_raw_content_has_required_structure(self, search_result):
         """Each raw_content item should have topic and sources."""
-        state = {
-            "topics": ["Test topic"],
-            "start_date": "2026-01-20",
-            "end_date": "2026-02-03",
-            "raw_content": [],
-            "search_iterations": 0,
-        }
-
-        result = search_news_node(state)
-
-        for item in result["raw_content"]:
+        for item in search_result["raw_content"]:
             assert "topic" in item
             assert "sources" in item
             assert isinstance(item["sources"], list)
@@ -0,0 +1,72 @@
+"""
+Unit tests for the video searcher node.
+"""
+import time
+
+from nodes.video_searcher import video_searcher_node
+
+
+class TestVideoSearcherNode:
+    """Tests for video_searcher_node function."""
+
+    def test_concurrent_searches_keep_topic_order(self, mock_tavily):
+        """Videos should be selected in topic order even when later searches finish first."""
+        def search(query, **kwargs):
+            time.sleep(0.05 if query == "first" else 0)
+            return {"results": [{"url": f"https://youtu.be/{query}", "title": query, "content": ""}]}
+
+        mock_tavily.search.side_effect = search
+
+        result = video_searcher_node({"topics": ["first", "second"], "objective": "x"})
+
+        assert [v["title"] for v in result["video_sources"]] == ["first", "second"]
+
+    def test_dedupes_videos_by_id_across_url_forms(self, mock_tavily):
+        """youtu.be links and embedded watch URLs for the same id yield one video."""
+        mock_tavily.search.return_value = {"results": [
+            {"url": "https://youtu.be/abc123", "title": "Direct", "content": ""},
+            {"url": "https://news.com/a", "title": "Article",
+             "content": "see https://www.youtube.com/watch?v=abc123 and youtu.be/xyz789"},
+        ]}
+
+        result = video_searcher_node({"topics": ["t"], "objective": "x"})
+
+        assert [v["url"] for v in result["video_sources"]] == [
+            "https://www.youtube.com/watch?v=abc123",
+            "https://www.youtube.com/watch?v=xyz789",
+        ]
+
+    def test_repeated_queries_hit_tavily_once(self, mock_tavily):
+        """A broad query equal to an already-searched topic should not be searched again."""
+        mock_tavily.search.return_value = {"results": []}
+
+        video_searcher_node({"topics": ["EV sales", "EV sales"], "objective": "EV sales"})
+
+        queries = [call.kwargs["query"] for call in mock_tavily.search.call_args_list]
+        assert sorted(queries) == ["EV sales", "EV sales highlights", "EV sales news"]
+
+    def test_zero_max_videos_returns_no_videos(self, mock_tavily, monkeypatch):
+        """MAX_VIDEOS=0 should disable the search instead of crashing the pool."""
+        monkeypatch.setattr("nodes.video_searcher.MAX_VIDEOS", 0)
+
+        result = video_searcher_node({"topics": ["t"], "objective": "x"})
+
+        assert result["video_sources"] == []
+        mock_tavily.search.assert_not_called()
+
+    def test_stops_searching_once_cap_is_reached(self, mock_tavily, monkeypatch):
+        """Topics past the ones needed to fill MAX_VIDEOS should not be searched."""
+        monkeypatch.setattr("nodes.video_searcher.MAX_VIDEOS", 2)
+        monkeypatch.setattr("nodes.video_searcher.MAX_VIDEOS_PER_TOPIC", 2)
+
+        def search(query, **kwargs):
+            return {"results": [
+                {"url": f"https://youtu.be/{query}{n}", "title": query, "content": ""} for n in range(2)
+            ]}
+
+        mock_tavily.search.side_effect = search
+
+        result = video_searcher_node({"topics": ["a", "b", "c"], "objective": "x"})
+
+        assert len(result["video_sources"]) == 2
+        assert [call.kwargs["query"] for call in mock_tavily.search.call_args_list] == ["a"]